@@ -0,0 +1,136 @@
+import argparse
+import random
+
+# Synthetic WhatsApp-style chat exports for the benchmarks. Messages use the three header forms the engine
+# handles, and issue messages use phrases that classify into each issue category.
+
+# Sample Malay/English phrases per issue category (each one classifies into its own category)
+ISSUE_SAMPLES = {
+    "Full Capping": ["mohon bantuan id ui full capping", "id ui capping full, tidak boleh assign pada team", "slot id x lepas, full slot"],
+    "Order Missing/ Pending Processing": ["order tiada dalam oal", "tmf tak wujud untuk order ini", "status pending processing dari pagi"],
+    "Missing Manual Assign Button": ["button manual assign tak keluar", "manual slot tak jalan"],
+    "Next Activity Not Appear": ["next activity tak appear lagi", "cc not appear selepas done", "no pending user activity"],
+    "Double @iptv": ["double iptv pelanggan"],
+    "Equipment New to Existing": ["mohon tukar ke existing", "mohon jadikan existing sahaja"],
+    "Design & Assign": ["stuck di d&a", "order status design"],
+    "HSI No Password": ["xda password hsi untuk pelanggan", "nak password hsi"],
+    "CPE New/ Existing/ Delete": ["existing ke new untuk rg", "minta bantu delete existing"],
+    "Update CPE Equipment Details": ["tidak boleh replace mesh", "order force done equipment tak sama tmf"],
+    "Missing/ Update Network Details": ["granite network info tak keluar", "refresh granite info"],
+    "Update Contact Details": ["mohon update contact number", "tukar contact pelanggan"],
+    "Update Customer Email": ["email pelanggan salah"],
+    "Bypass HSI": ["mohon bypass hsi", "session up verify fail"],
+    "Bypass Voice": ["mohon bypass voice"],
+    "Bypass IPTV": ["mohon bypass upb", "mohon bypass ip"],
+    "Bypass Extra Port": ["mohon bypass extra port"],
+    "Revert Order to TMF": ["revert order ke tmf semula", "remove mdf"],
+    "Release Assign To Me": ["mohon release order", "release assign to me"],
+    "Propose Cancel to Propose Reappt/ Return": ["order propose cancel nak proceed", "rtn cancel"],
+    "Unsync Order": ["status not sync dengan nova", "unsync order"],
+    "Order Transfer SWIFT-TMF": ["mohon transfer ke tmf"],
+    "Duplicated Order Activity": ["order duplicate di portal"],
+    "TT RG6/ Combo Update": ["sn baru combo", "tukar combo box serial number"],
+    "TT CPE LOV": ["list faulty reason tak keluar"],
+    "TT Unable to Slot/ Error 400": ["ctt unable to slot", "keluar error 400 masa slot"],
+    "TT Missing/ Update Network Details": ["missing cab id", "update granite untuk ctt"],
+    "TT V1P": ["ctt v1p mohon bantu", "pelanggan whp"],
+    "TT CPE Not Tally with Physical": ["s/n tak sama dengan fizikal", "xboleh close ctt"],
+    "TT Link LR Appear TMF": ["ctt link lr appear tmf", "ntt linkage"],
+    "TT Blank Source Skill": ["blank source skill"],
+    "ID Locking/ Unlock/ 3rd Attempt": ["mohon unlock id", "tak boleh login tmf"],
+    "TT Unsync": ["ctt unsync", "trigger ctt semula"],
+    "TT Missing": ["ctt missing dalam tmf", "mohon retrigger ctt"],
+    "TT Update DiagnosisCode": ["diagnosis missing"],
+    "TT Granite Network Info Error": ["camelia detect data no found"],
+    "TT HSBA Reappointment": ["appt hsba esok"],
+    "Resource Management Issue": ["salah zone id"],
+}
+
+# Messages that match no issue category
+CHATTER = [
+    "terima kasih", "ok noted boss", "sila semak semula", "baik, saya check", "noted, on the way",
+    "thanks team", "good morning all", "done ya", "sudah settle", "boleh tolong tengok order ini"
+]
+
+# Staff names (excluded by the default base names) and other senders
+STAFF = ["Hartina", "Normah", "Pom", "Afizan", "Ariff", "Hazrina", "Nurul", "Zazarida"]
+SENDERS = ["Ali", "Abu Bakar", "Siti", "Kamal TM", "Farah", "Ahmad Zaki", "Mei Ling", "Raju"]
+
+
+# Function to make a random ticket/order number in one of the formats ticket_order_pattern accepts
+def random_ticket(rng):
+    kind = rng.randrange(5)
+    if kind == 0:
+        return f"1-{rng.randrange(10 ** 8, 10 ** 11)}"
+    if kind == 1:
+        return f"T-{rng.randrange(10 ** 9):09d}"
+    if kind == 2:
+        return f"t-{rng.randrange(10 ** 10):010d}"
+    if kind == 3:
+        return "1-" + "".join(rng.choice("abcdefghijklmnopqrstuvwxyz0123456789") for _ in range(7))
+    return "INC"
+
+
+# Function to make a random ID in one of the formats id_pattern accepts
+def random_id(rng):
+    if rng.random() < 0.5:
+        return f"Q{rng.randrange(10 ** 6):06d}"
+    return f"TM{rng.randrange(10 ** 5):05d}"
+
+
+# Function to make a message header in one of the export formats: 24-hour (starts a block and a message),
+# 12-hour with minutes (starts a block only) or 12-hour without minutes (starts a message only, in lowercase
+# as it reaches message splitting)
+def random_header(rng, sender):
+    day, month, year = rng.randint(1, 28), rng.randint(1, 12), rng.choice([2023, 2024])
+    hour, minute = rng.randrange(24), rng.randrange(60)
+    kind = rng.randrange(3)
+    if kind == 0:
+        return f"[{hour:02d}:{minute:02d}, {day}/{month}/{year}] {sender}: "
+    if kind == 1:
+        return f"[{day}/{month}/{year} {hour % 12 or 12}:{minute:02d} {'AM' if hour < 12 else 'PM'}] {sender}: "
+    return f"[{day}/{month}/{year} {hour % 12 or 12} {'am' if hour < 12 else 'pm'}] {sender}: "
+
+
+# Function to yield the lines of a synthetic export with the given number of messages.
+# issue_ratio is the share of messages with an issue phrase, multiline_ratio the share spread over several lines.
+def iter_export_lines(messages, seed=0, issue_ratio=0.4, staff_ratio=0.3, multiline_ratio=0.2):
+    rng = random.Random(seed)
+    issues = list(ISSUE_SAMPLES.values())
+
+    for _ in range(messages):
+        sender = rng.choice(STAFF if rng.random() < staff_ratio else SENDERS)
+
+        if rng.random() < issue_ratio:
+            parts = [rng.choice(rng.choice(issues))]
+        else:
+            parts = [rng.choice(CHATTER)]
+
+        # Most messages carry one to three tickets/IDs, as in the real groups
+        for _ in range(rng.choice([0, 1, 1, 1, 2, 3])):
+            parts.append(random_ticket(rng) if rng.random() < 0.6 else random_id(rng))
+        rng.shuffle(parts)
+
+        if rng.random() < multiline_ratio:
+            split = rng.randint(1, len(parts))
+            yield random_header(rng, sender) + " ".join(parts[:split])
+            yield " ".join(parts[split:]) or rng.choice(CHATTER)
+        else:
+            yield random_header(rng, sender) + " ".join(parts)
+
+
+# Function to write a synthetic export to path
+def write_export(path, messages, seed=0, **options):
+    with open(path, "w", encoding="utf-8") as export_file:
+        for line in iter_export_lines(messages, seed, **options):
+            export_file.write(line + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic WhatsApp chat export for benchmarking.")
+    parser.add_argument("messages", type=int, help="number of messages (e.g. 1000 to 1000000)")
+    parser.add_argument("output", help="path of the .txt file to write")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    write_export(args.output, args.messages, args.seed)
@@ -0,0 +1,171 @@
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import tmf_reporter as app
+from benchmarks.generate import iter_export_lines
+
+# Benchmark suite for the cleaning and classification engine, run as: python -m benchmarks.run
+# Each stage is timed on a synthetic export (best of --repeat runs) and measured once more under
+# tracemalloc for peak memory. Results can be saved as a named baseline and compared against later.
+
+# Default folder for named baselines (ignored by git; they are machine-specific)
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+
+BASE_NAMES = app.parse_base_names(app.DEFAULT_BASE_NAMES)
+
+
+# Function to build the sender matcher and issue classifier, compiling them up front instead of on first use
+def build_engine():
+    return app.SenderMatcher(BASE_NAMES).compile(), app.IssueClassifier(app.issue_patterns).compile()
+
+
+# Function to build the stages to benchmark for one export; each stage is a function of no arguments.
+# The classify and filtered stages read filtered_bytes, an export without staff messages that keeps its lines
+# (like the filtered files uploaded in Step 2), so every header form splits messages as it would there.
+def build_stages(export_bytes, filtered_bytes, workers):
+    sender_matcher, classifier = build_engine()
+    filtered_text = filtered_bytes.decode("utf-8")
+
+    def filter_stage():
+        app.filter_messages({"export.txt": io.BytesIO(export_bytes)}, sender_matcher)
+
+    def classify_stage():
+        app.process_messages_from_content(filtered_text, classifier, app.ticket_order_pattern, app.id_pattern)
+
+    def pipeline_stage():
+        app.process_uploaded_file(io.BytesIO(export_bytes), sender_matcher, classifier, app.ticket_order_pattern, app.id_pattern)
+
+    def filtered_stage():
+        sources = {"export.txt": (io.BytesIO(filtered_bytes), None)}
+        app.process_uploaded_files(sources, classifier, app.ticket_order_pattern, app.id_pattern, 1)
+
+    def parallel_stage():
+        sources = {"export.txt": (io.BytesIO(export_bytes), sender_matcher)}
+        app.process_uploaded_files(sources, classifier, app.ticket_order_pattern, app.id_pattern, workers)
+
+    return {
+        "build": build_engine,
+        "filter": filter_stage,
+        "classify": classify_stage,
+        "pipeline": pipeline_stage,
+        "filtered": filtered_stage,
+        "parallel": parallel_stage
+    }
+
+
+# Function to time one stage (best of repeat) and measure its peak traced memory
+def measure(stage, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        stage()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    stage()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return best, peak
+
+
+# Function to run the whole suite for each export size
+def run_suite(sizes, repeat, seed, workers, stage_names=None):
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "seed": seed,
+        "sizes": {}
+    }
+
+    for messages in sizes:
+        export_bytes = ("\n".join(iter_export_lines(messages, seed)) + "\n").encode("utf-8")
+        filtered_bytes = ("\n".join(iter_export_lines(messages, seed, staff_ratio=0)) + "\n").encode("utf-8")
+        stages = build_stages(export_bytes, filtered_bytes, workers)
+
+        results = {}
+        for name, stage in stages.items():
+            if stage_names and name not in stage_names:
+                continue
+            seconds, peak = measure(stage, repeat)
+            # "build" is one-off setup, so a throughput figure would mean nothing
+            results[name] = {
+                "seconds": round(seconds, 6),
+                "messages_per_sec": round(messages / seconds, 1) if seconds and name != "build" else None,
+                "peak_mb": round(peak / 2 ** 20, 3)
+            }
+            print(f"{messages:>9} {name:<10} {seconds:>10.4f}s {results[name]['messages_per_sec'] or 0:>14,.0f} msg/s "
+                  f"{results[name]['peak_mb']:>10.2f} MB", flush=True)
+
+        # Messages the classify stage splits the filtered export into (12-hour headers with minutes do not split)
+        split_messages = sum(1 for _ in app.iter_messages(filtered_bytes.decode("utf-8").split("\n")))
+        report["sizes"][str(messages)] = {"bytes": len(export_bytes), "split_messages": split_messages, "stages": results}
+
+    return report
+
+
+# Function to compare a report with a baseline; returns the stages slower than baseline by more than tolerance
+def compare(report, baseline, tolerance):
+    regressions = []
+
+    for size, entry in report["sizes"].items():
+        base_stages = baseline["sizes"].get(size, {}).get("stages", {})
+        for name, result in entry["stages"].items():
+            if name not in base_stages:
+                continue
+            ratio = result["seconds"] / base_stages[name]["seconds"] if base_stages[name]["seconds"] else 1.0
+            memory_ratio = result["peak_mb"] / base_stages[name]["peak_mb"] if base_stages[name]["peak_mb"] else 1.0
+            flag = "REGRESSION" if ratio > 1 + tolerance else ""
+            print(f"{size:>9} {name:<10} time x{ratio:.2f}  memory x{memory_ratio:.2f}  {flag}")
+            if flag:
+                regressions.append((size, name, ratio))
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark filter_messages / process_messages_from_content on synthetic exports.")
+    parser.add_argument("--messages", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="export sizes in messages (e.g. 1000 10000 100000 1000000)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage; the best one is kept")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes for the parallel stage")
+    parser.add_argument("--stages", nargs="+", help="only run these stages")
+    parser.add_argument("--output", help="also write the report as JSON to this path")
+    parser.add_argument("--baseline-dir", default=BASELINE_DIR, help=f"folder of named baselines (default: {BASELINE_DIR})")
+    parser.add_argument("--save-baseline", metavar="NAME", help="store the report as a baseline in --baseline-dir")
+    parser.add_argument("--compare", metavar="NAME", help="compare against a stored baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed slowdown before a stage counts as a regression")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.messages, args.repeat, args.seed, args.workers, args.stages)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(report, output_file, indent=2)
+
+    if args.save_baseline:
+        os.makedirs(args.baseline_dir, exist_ok=True)
+        with open(os.path.join(args.baseline_dir, f"{args.save_baseline}.json"), "w", encoding="utf-8") as baseline_file:
+            json.dump(report, baseline_file, indent=2)
+
+    if args.compare:
+        with open(os.path.join(args.baseline_dir, f"{args.compare}.json"), encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        if compare(report, baseline, args.tolerance):
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
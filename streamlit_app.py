@@ -1,5 +1,26 @@
 import streamlit as st
-import re
+import io
+import json
+import os
+
+from tmf_reporter import (
+    DEFAULT_BASE_NAMES,
+    IssueClassifier,
+    PatternProfiler,
+    ResultCache,
+    SenderMatcher,
+    TicketIndex,
+    iter_file_blocks,
+    id_pattern,
+    issue_patterns,
+    parse_base_names,
+    process_uploaded_files,
+    ticket_order_pattern,
+    write_cleaned_text,
+    write_csv,
+    write_json,
+    write_text,
+)
 
 # Inject custom CSS to change the cursor for disabled text areas
 st.markdown("""
@@ -10,136 +31,82 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-# Function to process the uploaded files for text file processing with regex filtering
-def filter_messages(input_files, base_names):
-    timestamp_pattern = re.compile(r'\[\d{2}:\d{2}, \d{1,2}/\d{1,2}/\d{4}\]|^\[\d{1,2}/\d{1,2}/\d{4} \d{1,2}:\d{2} [APM]{2}]')
-    name_patterns = [re.compile(rf'\b{re.escape(name)}\b', re.IGNORECASE) for name in base_names]
-
-    results = {}
-    
-    for file_name, file_data in input_files.items():
-        file_content = file_data.getvalue().decode("utf-8")
-        lines = file_content.splitlines()
-
-        filtered_lines = []
-        skip_block = False
-        current_message = []
-
-        for line in lines:
-            if timestamp_pattern.match(line):
-                if current_message:
-                    filtered_lines.append(' '.join(current_message).strip().lower())
-                    current_message = []
-
-                if any(pattern.search(line) for pattern in name_patterns):
-                    skip_block = True
-                else:
-                    skip_block = False
+# Streamlit app
+st.title("TMF Daily Report Generator")
 
-            if not skip_block:
-                current_message.append(line.strip().lower())
+# 1. Section for "Text File Processor with Regex Filtering"
+st.header("1. Text File Processor with Regex Filtering")
 
-        if not skip_block and current_message:
-            filtered_lines.append(' '.join(current_message).strip().lower())
+# Input section for base names
+base_names_input = st.text_input(
+    "Enter base names (comma-separated) -- These names are to be removed after filtering", 
+    DEFAULT_BASE_NAMES
+)
+base_names = parse_base_names(base_names_input)
 
-        filtered_text = '\n\n'.join(filtered_lines)
-        results[file_name] = filtered_text
 
-    return results
+# Build the sender matcher once; Streamlit reuses it across reruns until the names change
+@st.cache_resource
+def build_sender_matcher(base_names):
+    return SenderMatcher(base_names)
 
+sender_matcher = build_sender_matcher(tuple(base_names))
 
-# Function to process the text file input
-def process_messages_from_content(file_content, issue_patterns, ticket_order_pattern, id_pattern):
-    # Split content into individual messages based on the pattern of new blocks
-    messages = re.split(r'\n(?=\[\d{1,2}/\d{1,2}/\d{4} \d{1,2} (?:am|pm)\])|\[\d{2}:\d{2}, \d{1,2}/\d{1,2}/\d{4}\]', file_content)
-    
-    result = {
-        "Full Capping": [],
-        "Other": []
-    }
+# Characters of cleaned text previewed per file; the full cleaned text is only written for its download
+PREVIEW_CHARS = 20_000
 
-    added_tickets = set()
-    added_ids = set()
-
-    # Process each message block
-    for message in messages:
-        found_issue = False
-
-        # Check for issues and collect tickets/IDs
-        for issue, pattern in issue_patterns.items():
-            if re.search(pattern, message, re.IGNORECASE):
-                tickets = re.findall(ticket_order_pattern, message)
-                ids = re.findall(id_pattern, message)
-
-                if issue == "Full Capping":
-                    if ids:
-                        result[issue].extend(i for i in ids if i not in added_ids)
-                        added_ids.update(ids)
-                else:
-                    if tickets:
-                        result[issue].extend(t for t in tickets if t not in added_tickets)
-                        added_tickets.update(tickets)
-                    if ids:
-                        result[issue].extend(i for i in ids if i not in added_ids)
-                        added_ids.update(ids)
-                
-                found_issue = True
-                break
-
-        if not found_issue:
-            tickets = re.findall(ticket_order_pattern, message)
-            ids = re.findall(id_pattern, message)
-            if tickets or ids:
-                if tickets:
-                    result["Other"].extend([(t, message) for t in tickets if t not in added_tickets])
-                    added_tickets.update(tickets)
-                if ids:
-                    result["Other"].extend([(i, message) for i in ids if i not in added_ids])
-                    added_ids.update(ids)
-
-    return result
 
+# Function to get the start of an upload's cleaned text, at most limit characters, and whether there is more
+def cleaned_preview(file_data, sender_matcher, limit=PREVIEW_CHARS):
+    pieces = []
+    size = 0
+    for index, block in enumerate(iter_file_blocks(file_data, sender_matcher)):
+        if size >= limit:
+            return ''.join(pieces)[:limit], True
+        pieces.append(f"\n\n{block}" if index else block)
+        size += len(pieces[-1])
 
-# Streamlit app
-st.title("TMF Daily Report Generator")
+    return ''.join(pieces)[:limit], size > limit
 
-# 1. Section for "Text File Processor with Regex Filtering"
-st.header("1. Text File Processor with Regex Filtering")
 
-# Input section for base names
-base_names_input = st.text_input(
-    "Enter base names (comma-separated) -- These names are to be removed after filtering", 
-    "Hartina, Tina, Normah, Pom, Afizan, Pijan, Ariff, Dheffirdaus, Dhef, Hazrina, Rina, Nurul, Huda, Zazarida, Zaza, Eliasaph Wan, Wan, ] : "
-)
-base_names = [name.strip() for name in base_names_input.split(",")]
+# Function to get a download callback that streams something into a UTF-8 export only when its button is clicked;
+# write is called with args followed by the open text file
+def export_data(write, *args):
+    def build():
+        export = io.BytesIO()
+        text = io.TextIOWrapper(export, encoding="utf-8", newline="")
+        write(*args, text)
+        text.flush()
+        text.detach()
+        export.seek(0)
+        return export
+    return build
 
 # File upload for raw text files
 uploaded_raw_files = st.file_uploader("Upload the file(s) containing the raw text messages", accept_multiple_files=True, type="txt")
 
-# Session state to store cleaned text
-if 'cleaned_texts' not in st.session_state:
-    st.session_state.cleaned_texts = {}
+# Session state to store the cleaned sources; Step 2 re-streams them instead of keeping the cleaned text
+if 'cleaned_files' not in st.session_state:
+    st.session_state.cleaned_files = {}
 
 # Button for processing raw files with regex filtering
 if st.button("Clean text messages"):
     if uploaded_raw_files:
-        input_files = {file.name: file for file in uploaded_raw_files}
-        
-        # Process the uploaded files with the provided base names
-        results = filter_messages(input_files, base_names)
-
-        # Display and store the cleaned texts in session state
-        for file_name, filtered_text in results.items():
-            st.session_state.cleaned_texts[file_name] = filtered_text
-            st.subheader(f"Filtered content for {file_name}:")
-            st.text_area(f"Processed Content: {file_name}", filtered_text, height=300, disabled=True)
-
-        # Option to download the cleaned files
-        for file_name, filtered_text in results.items():
+        # Display a preview of the cleaned texts and remember their sources in session state
+        for file in uploaded_raw_files:
+            st.session_state.cleaned_files[file.name] = (file, sender_matcher)
+            preview, truncated = cleaned_preview(file, sender_matcher)
+            st.subheader(f"Filtered content for {file.name}:")
+            st.text_area(f"Processed Content: {file.name}", preview, height=300, disabled=True)
+            if truncated:
+                st.caption(f"Showing the first {PREVIEW_CHARS:,} characters; download the file for the full text.")
+
+        # Option to download the cleaned files, written from the uploads when the button is clicked
+        for file in uploaded_raw_files:
             st.download_button(
-                label=f"Download cleaned {file_name}",
-                data=filtered_text,
-                file_name=f"cleaned_{file_name}",
+                label=f"Download cleaned {file.name}",
+                data=export_data(write_cleaned_text, file, sender_matcher),
+                file_name=f"cleaned_{file.name}",
                 mime="text/plain"
             )
     else:
@@ -151,51 +118,29 @@ st.header("2. Message Processor for Text Files")
 # File upload for filtered text messages
 uploaded_filtered_files = st.file_uploader("Upload the file(s) containing the filtered text messages", accept_multiple_files=True, type="txt", key="filtered_uploader")
 
-# Define issue patterns
-issue_patterns = {
-    "Full Capping": r'\bfull cap[p]?ing\b|\bbukan dlm id ui\b|\bcap(p)?ing full\b|\b(tidak|x) as(s)?ign pd ru\b|\bfull slot\b|\btidak boleh ass(i)?gn pada team\b|\bslot id( ni)? x( ?)lepas\b|\bn(a)?k slot id\b|\bfull dalam list\b|\bcapping penuh\b|\bid.*full t(a)?p(i)? d(a)?l(a)?m list tmf.*ada \d order\b|\bui.*(tak|x) n(a)?mp(a)?k (d)?(e)?kat dia\b|\bui kata (x|tak) n(a)?mp(a)?k o(r)?d(e)?r\b|\bbukan ui pnya\b|\bslot balik p(a)?d(a)? (team|ru|ra|ui)\b|\border return(ed)? s(e)?m(a)?l(a)?m.*m(a)?s(i)?h ada d(a)?l(a)?m tm( )?f(orce)?.*ru\b|\bui inf(o)?(r)?m (t(a)?k|x) n(a)?mp(a)?k order\b|\bini order m(e)?m(a)?(n)?g ru p(u)?(n)?ya\b|\b(belum ada|xada|teda|tiada) id mana(2)? ru\b|\b(tidak|tak|x) d(a)?p(a)?t( )?(nak)?assign.*(ru|team)\b|\bord(er)?.*tak( )?d(a)?p(a)?t.*assign p(a)?d(a)? (team|ru)\b|\bbukan order (ui|team)\b|\bid( dah)?( )?full.*d(a)?l(a)?m tm( )?f(orce)?.*hanya ada [1-9] order\b|\b(takleh|xboleh|xleh) slot id\b|\bin( )?hand ui.*assign( ke)? ui\b|\bmasih full/7 order\b|\bin hand.*yg nak assign\b|\bid.*ada \d order t(a)?p(i)? id.*full\b|\bfull.*t(a)?p(i)?.*tm( )?f(orce)? ada \d order\b|\bo(r)?der (d(i)?|p(a)?d(a)?)( id)? ui\b|\bid ni.*(x|tak|tidak)( )?l(e)?p(a)?s.*slot order( lain)?\b|\bd(a)?h full (x|tak)( )?l(e)?p(a)?s slot( order)?\b|\border# ada dlm inhand.*order# nak assign ke ui\b|\btmf saya detect baru \d order\b|\border.*perlu.*masuk.*t(a)?p(i)? (x|tak)( )?(boleh|leh)( masuk)?\b|\bini b(u)?k(a)?n.*ini p(e)?(r)?lu.*masuk(kan)?\b|\btmf.*detect \d order\b|\bfull cappinng\b|\bcapping.*(full|p(e)?n(u)?h)\b',
-    "Order Missing/ Pending Processing": r'\b(di|dlm|dalam) (oal|order(?: activity)?(?: list)?)\b|\btmf (?:tak (?:wujud|appear)|x ?appear)\b|\b(di dlm oal|di oal|oal missing|tmf tak wujud|oal record not found|oal not found|oal xfound|oal xappear|oal not appear|oal x appear)\b|\b(?:tiada |masukkan |appear )?(?:order )?(dlm|dalam|in) rol\b|\b(tiada (dalam|dlm)|xda(?: di)?)( scheduled page)\b|\bponr\b|\bpending processing\b|\bmissing( dalam)? oal\b|\b(x?|tak ) masuk( di)?( dlm| dalam)( bakul| basket)\b|\b(?:order\s)?(?:tak\s|tiada\s|xda\s)?(?:masuk\s)?(?:dalam\s)?(?:bakul|basket)\b|\b(tiada|xda|takda) di( dalam)?( page)? activity\b|\btask sync\b|\bpending processing\b|\b(tak|x|tiada)\s*(?:di|dekat|dkt|dalam|dlm)?\s*(scheduled|unscheduled)( page)?\b|\btiada (dlm|dalam) (activity|act|aktivity|actvty) list\b|\b(xtvt|act|activity|actvty) (tak|x) (wujud|wjd)\b|\bmasukkan semula.*rol\b|\bstat(u)?(s)? unshedule(d)?.*(ra|mir|cc)\b|\bstatus( pending)?( )?processing\b|\bo(r)?d(e)?r.*(x|tak)( )?masuk (tmf|tmforce)\b|\b(order )?jadi unschedule(d)?\b|\breschedule(d)?( semula)? ke tm( )?f(orce)?\b|\border x( )?appear( at| di| in)? oal\b|\border ni ada (di)?( )?mana\b|\border return.*status unschedul(e)?(d)?\b|\bb(u)?(t)?t(o)?n return (tiada|xda|xde|takda)\b|\border return(ed)? jadi uns(c)?hedule(d)?\b|\border pending pro(c)?es(s)?ing\b|\border.*hilang.*id ui\b|\border ra.*(tak|x) (m(a)?s(u)?k d(a)?l(a)?m (act(ivity)?)|aktiviti|xtvt) order list\b|\bupdate semula ke rol\b|\btiada|xda d(a)?l(a)?m ro(l|c)\b|\bescalate( )?(ke|m(a)?s(u)?k|d(a)?l(a)?m)?( )?rol\b|\border return j(a)?d(i)? unschedul(e)?(d)?\b|\bb(e)?l(u)?m appear d(a)?l(a)?m act(ivity)? list\b|\border (tidak|x|tak) n(a)?m(p)?(a)?k d(a)?l(a)?m.*d\b|\brecord not found.*slot\b',
-    "Missing Manual Assign Button": r'\bma\b|\b([.*]anual|man[n]?ual) (assign|slot|assgn|assigned)\b|\btm( )?f(orce)? (takdak|tiada|xd(a|e)) m(anual)?(.)?( )?assign\b', #ma btn xappear
-    "Next Activity Not Appear": r'\b(?:next )?(?:activity )?tak appear\b|\b(xda|tiada) (cc|mir|ra)\b|\b(mir|ra|cc) (tiada|not appear|xappear|x appear|tak|x|missing)\b|\b(mir|ra|cc).*(ip|inprogress|missing)\b|\bnext (?:(owner|activity|act|actv))\b|\breturn(?: order)(?: list)\b|\bnot found(?: to)? (ra|mir|cc)\b|\bmir/?ra (in|ip)\b|\bcc (belum|x) appear\b|\b(mir|ra) in progress\b|\b(act|activity|activities|aktiviti) (x|not)\b|\b(masuk|masukkan)( ke (dalam|dlm))? rol\b|\bmasukkan order ke rol\b|\b(nxt|next)? (actvty|act|activities|activity|aktiviti) (not appear|xappear|xfound|not found|missing)\b|\blist rol\b|\bmasih unschedu(led)?\b|\bnpua|no pending user activity|pending (activity|act|activities|actvty)\b|\b(order )?(tiada|takda|xda) owner\b|\baktifkan order utk ra\b|\b(cc|ma|manual assign)(.*keluar|tiada)\b|\bpending (cc|ma|mir)\b|\b(nova )?(aktiviti|act|actvty|activity)? (tidak)? [x]?update[d]?\b|\bt[u|i]?ada bu[t]?ton (cc|mir|ra)\b|\bmissing owner\b|\b(tak|x) k(e)?luar cc\b|\bno pending user\b|\b(cc|mir|ra) m(a)?s(i)?h (tak|x) appear\b|\b(ra|mir|cc) status in( |-)?progres(s)?\b|\bmasuk(kan)?.*r(r)?ol\b|\bnext (xtvt|act|activity|actvty|aktiviti).*appear\b|\bbelum (r)?rol\b|\bcc (t(i)?d(a)?k|tak|x) muncul\b|\btiada (butang|b(u)?(t)?t(o)?n) cc\b|\border (tiada|xd(e|a)) d(a)?l(a)?m roc\b|\b(confirmation call|cc) (tak|x|tiada) appear(ed)?\b|\btiada.*done cc\b|\bmir(\/)?( )?ra m(a)?s(i)?h in( )?progres(s)?\b|\bmir(\/)?( )?ra.*(in progress|(i)?( )?(p)?)\b|\bbelum.*(cc|mir|mir/ra) appear\b|\bmir( )?(&)?( )?ra\b|\bmi(r)?(-)?ip\b|\bcc( )?(not|x|t(a)?k)( )?( )?appear\b|\bo(r)?der m(a)?s(i)?h (sangkut|sekat|stuck|missing)\b', #mir masih ip/ ra masih ip/ cc not appear/ next owner/ NPUA
-    "Double @iptv": r'\b(?:double )?iptv(?:@iptv)?\b',
-    "Equipment New to Existing": r'\b(?:new )?(ke|to|kepada) (existing|exstng|existhing)\b|\bexisting(kan| kan?)( onu|btu|sp|router|wifi|wi-fi|rg|modem)\b|\btukar ke (existing|esxting)\b|\bmohon jadikan existing\b|\bupdate(d)?.*existing\b|\bmohon tukar.*existing\b|\bmohon existing( )?(kan)?\b|\bexisting(kan)?.*order relocat(e)?(d)?\b|\b(order relocate)?.*tukar.*(jadi|ke) ex(i)?(s)?ting\b|\bbantuan order force done cancel\b|\bmohon.*j(a)?di ex(i)?(s)?ting\b|\bj(a)?d(i)?k(a)?n.*ex(i)?(s)?ting\b|\border relocate existing( )?k(a)?n (btu|sp|mesh|service point)\b|\badd existing (mesh|sp|service point|rg|router|wifi|wi-fi)\b',
-    "Design & Assign": r'\b(d&a|dna|design|d&n (&|and) assign)\b|\bd&n\b|\bd&s ip\b',
-    "HSI No Password": r'\b(xda|tiada) (pw|password) (hsi|ppoe)\b|\b(xda|tiada) (hsi|ppoe) (pw|password)\b|\bnak (password|pw|pass|pword) h(s)?(i)?\b',
-    "CPE New/ Existing/ Delete": r'\btukar existing\b|\b(extng|exstng|existing) (ke|to) new\b|\b(uonu|rg|btu|sp|wifi|router) (ke|kepada|to) new\b|\b(update|updte|updt)( .*)?( new)\b|\bexisting (to|ke|kpda|kepada) new\b|\bm(o)?h(o)?n (del|delete).*(relocate)?\b|\bt(u)?k(a)?rkan existing.*new\b|\b(upd(a)?t(e)?|add).*new.*order modify\b|\b(granite)?(service point|sp|btu).*subsequent\b|\badd new( ata)?\b|\bupdate(d)?.*(pd|kpd|kpada|kepada|pada).*new\b|\bcpe y(an)?g new hanya (mesh|rg|modem)?.*done.*exist(ing)?.*tukar\b|\btmf ad(a|e).*no del.*nova.*del\b|\border new install.*existing tukar new\b|\bb(a)?ntu tukar.*k(e)?p(a)?d(a)? combo\b|\badd (service point|sp|btu).*order modify\b|\badd (service point|sp|mesh) ke new\b|\border existing.*(eqp|equipment) (x|tak)( )?s(a)?m(a)?\b|\bbantuan.*replace cpe baru\b|\bminta b(a)?ntu del(ete)?( )?( )?existing\b|\bbantu del(ete)? (equipment|eqp|eqmnt)\b|\bdelete combo mesh\b|\badd.*d(a)?l(a)?m eq(u)?(i)?(p)?m(e)?n(t)?\b|\bbantu tukar(kan)? rg5 k(e|r) rg6.*order (ni|new install)\b|\border modify minta add (equipment|eqmnt|eqp)\b',
-    "Update CPE Equipment Details": r"\btidak boleh(?: (?:replace|update|tukar))? (?:cpe|rg|router|wifi|mesh|btu|sp|service point)\b|\border modify\b(?=.*\b(sn lama\/existing|sn baru)\b)|\bmodify (fixed|fix) ip\b|\border relocate guna existing cpe\b|\b(btn|button).*(replace|rplce).*(existing)?\b|\border force done( equipment)?.*(tak|x)( )?sama.*(tmf|tmforce)\b|\border.*fd\b|\btukar equipment daripada vm kepada sbvm\b|\bui.*scan.*keluar err(or)?\b|\b(tidak|x|tak) d(a)?p(a)?t complete order.*m(a)?s(a)?l(a)?h cpe\b|\bcomplete order.*onu combo: (unc.*|rg6.*|comb.*)\b|\bequipment.*(tak|x)( )?s(a)?m(a)? d(e)?n(g)?(a)?n mesh\b|\border relocation.*err(or)?.*done(kan)?\b|\border force done.*er(r)?(o)?(r)?\b|\bru sudah guna yang betul dan cpe ada dlm list ru\b|\bnak replace mesh tapi takde button save/update\b|\bcpe.*hanya ada (rg|mesh|btu|sp|onu)\b",
-    "Missing/ Update Network Details": r"\b(fail to )?(slot )?(appointment|appmnt|apmt|appmt)\b|\btukar(kan)? (building|cab|cabinet|fdp|fp|fdc|dc)\b|\bxleh n(a)?k slot\b|\bgranite n(e)?twork info\b|\bft order ke hari ini\b|\bbooking c(a)?l(a|e)?nder (tak|x) keluar date available\b|\bgranite fail(ed)?\b|\brefresh granite info\b|\bslot not available\b|\bfailed to ra\b|\bexchange (berlainan|lain) d(a)?l(a)?m tm( )?f(orce)?.*nova b(e)?t(u)?l\b",
-    "Update Contact Details": r"\b(updt|updte|update) (contact|ctc|hp|phone|mobile)( num| number)?\b|\b(tukar|tukarkan|tkr) (contact|ctc|phone)( number| #| num)?\b|\bctc num\b|\bremove nombor( pic)?\b",
-    "Update Customer Email": r"\bemail.*salah\b",
-    "Bypass HSI": r"\b(bypass|done|skip|donekan) (aktivity|act|activity|activities|actvty)?hsi\b|\bhsi.*bypas(s)?\b|\bby( )?pas(s)? h(si|is)\b|\bqos\b|\bdone( )?kan (hsi|his)\b|\bsession up verify fail\b|\bmohon by( )?pas(s)?( act(ivity)?)? hsi\b|\bbypas(s)?( testing)? (hsi|his)\b|\bby( )?pas(s)?.*(hsi|his)\b|\bo(r)?d(e)?r (force done|fd).*by( )?pas(s)? verification\b",
-    "Bypass Voice": r"\b(by pass|bypass).*voice\b|\bvobb.*bypass\b|\b(voice|vobb).*bypas(s)?\b|\bmohon by( )?pas(s)?( act(ivity)?)? voice\b",
-    "Bypass IPTV": r"\b(by pass|bypass).*iptv\b|\biptv.*bypas(s)?\b|\bbypas(s).*upb\b|\bmohon by( )?pas(s)?( act(ivity)?)? ip( )?(tv)?\b",
-    "Bypass Extra Port": r"\b(by pass|bypass) (extraport|extrapot|extra port|extra pot)\b|\bby( )?pas(s)? xp\b|\bbantuan bypass kan extraport\b|\bmohon by( )?pas(s)?( act(ivity)?)? (extra( )?port)\b|\bby( )?pas(s)? ext(r)?a( )?port\b",
-    "Revert Order to TMF": r"\brevert (order|order2).*ke(.*|tmf)\b|\bremove mdf\b",
-    "Release Assign To Me": r"\brelease (assign(?: to me)?|assgn)\b|\brelease(kan)? order\b|\brelease(kan)?( order)?( dari)? id\b|\bfail to slot\b|\brelease(kan)?( )?( )?dr id\b|\breleasekan( )?( )?order\b|\bfail(ed)? to rescheduled\b|\brelease from me\b|\brelease kan order\b|\brelease(k(a)?n)? order\b|\brelease(kan)? assign to me\b|\brelese(kan)?( order)?\b|\bmohon bantu r(e)?lease\b|\bmohon release(kan)?\b|\bfail to ra\b|\bbantuan release(kan)?.*1-(8|9)\d{10,11}.*q[0-9]{5,6}\b",
-    "Propose Cancel to Propose Reappt/ Return": r"\brcl|propose cancel|propose reappt\b|\brtn cancel\b|\brrol\b|\border proposed cancel.*nak proceed pasang\b|\brevert semula dari propose(d)? cancel ke (r)?rol\b|\baktif(kan)? s(e)?m(u)?la order( silap)? return(ed)? cancel((l)?ed)?\b|\br(e)?t(u)?(r)?n cancel(led)?.*proceed ra\b|\border propose(d)? cancel(led)? n(a)?k (ra|reappt)\b",
-    "Unsync Order": r"\bstatus not sync\b|\bunsync(h|ed)? order\b|\b(dalam|dlm) tmf( masih)?( status)? assign(ed)?\b|\bdone (tapi|tp) status( masih)? (ip|in progress|in-progress|inprogress)\b|\btmf.*schedule(d)?.*t(e)?(t)?(a)?p(i)?.*(nova)?complete(d)?.*(nova)?\b|\b(mohon )?tarik atau cancel (dari|dr) (tmf|tm( )?force)\b|\border.*status complete(d)?.*(x)( )?h(i)?l(a)?(n)?g d(a)?r(i)? tm( )?f(orce)?\b|\bt(e)?t(a)?p(i)? status m(a)?s(i)?h in( |-)?progress d(a)?l(a)?m( portal)? tm( )?f(orce)?\b|\bprocessing-complete\b|\bdone pending complete(d)?\b|\border( d(a)?h)? siap.*t(a)?p(i)?.*m(a)?s(i)?h processing\b|\bstatus.*(not|tak|x).*sync((h)?ed)? tm( )?f(orce)?.*nova\b|\b(activity|xtvt|aktivity).*nova done.*tm()?f(orce)?.*w(u)?j(u)?d\b|\btukar status k(e)?p(a)?d(a)? complet(ed)?\b|\border return(ed)? t(a)?p(i)? unschedule(d)?\b|\bcomplete(kan)? order.*p(e)?m(a)?s(a)?(n)?g(a)?n (siap|sudah|settle|beres)\b",
-    "Order Transfer SWIFT-TMF": r"\bmohon transfer ke tmf\b|\btransfer order ni ke tm( )?f(orce)?\b",
-    "Duplicated Order Activity": r"\bduplicate(d)? di( )?(portal|tm( )?f(orce)?)?\b",
-    "TT RG6/ Combo Update": r"\bnew (rg|router|wifi|mesh|btu|sp|service point)\b|\bs\/?n baru\b|\bnew\b.*\b(unc.*|mt.*|wfh.*|rg6.*|rgx.*|hp.*|com.*|uon.*)\b|\b(c)?tt.*(combo box|cbox|combo) sn: \b|\b(c)?tt.*(rg|rg6|combo|cbox|combo box)\b.*\b(unc|mt|wfh|rg6|rgx|hp|com|uon).*\b|\b(serial no|sn|serial)( baru| lama)?\b.*\b(unc|mt|wfh|rg6|rgx|hp|com|uon).*\b|\b(new)( rg)?\b.*\b(unc|mt|wfh|rg6|rgx|hp|com|uon).*\b|\b(new)(.*)?\b.*\b(unc|mt|wfh|rg6|rgx|hp|com|uon).*\b|\bsn rg baru( )?( )?:( )?(unc|mt|wfh|rg6|rgx|hp|com|uon).*\b|\b(s(/)?n) fizikal( )?(:)?( )?(unc|mt|wfh|rg6|rgx|hp|com|uon).*\b|\bs(\/)?n cpe baru(:)?(unc|mt|wfh|rg6|rgx|hp|com|uon).*\b|\btukar combo box.*(s(\/)?n|serial number)\b|\btukar.*combo.*(s(\/)?n|serial number)\b|\beqpmnt sama tapi keluar error\b|\b(x ?|tak ?)d(a)?p(a)?t (tukar|tkr).*(rg.*|com.*).*upgrade.*mb(p)?(s)?\b|\bcpe does not exist in hand\b|\b(tidak|x|tak) d(a)?p(a)?t t(u)?k(a)?r rg(5|6)\b|\bd(a)?p(a)?t err(or)?.*t(u)?k(a)?r cpe.*sn rg :( )?\b|\bmaklum pelanggan change equipment\b|\btiada detail.*equipment.*sn: \b|\b(replace)?( )?rg(4|5) (to|k(e)?p(a)?d(a)?) (rg6|combo)\b|\brg lama.*combo baru\b|\b(c)?tt no:  1-(8|9)\d{9,11}  lama :  baru : (unc[a-z0-9]{14,16}|rg[a-z0-9]{14,16})\b|\b(c)?tt.*1-(8|9)\d{10,11}.*baru.*lama( )?:( )?\b",
-    "TT CPE LOV": r"\bfaulty reason\b", # check list faulty reason tak keluar
-    "TT Unable to Slot/ Error 400": r"\b((c)?tt)( )?unable to slot((c)?tt)?\b|\bno( appoint)? slot\b|\b(error|err) 400\b|\bmcat\b|\btidak slot\b|\b(tidak|tak|x) (dapat|dpt|boleh) slot\b|\bskill ?set\b|\b(tiada|xda) (dp|dc|cab|fdc|fdp) id\b|\b(1-9\d{10,11}).*(tiada|xda)? slot appt\b|\b(tiada|xda)? slot appt.*(1-9\d{10,11})\b|\bslot (error|err)\b|\b(del|delete) (cab|cabinet|dp|fdp|fdc)\b|\bx ada (dp|cab) id\b|\bslot aptt\b|\bwork type\b|\b(tidak|x) auto slot\b|\bctt tiada slot\b|\bappoint err(or)?\b|\baptt error\b|\b(add|tambah) (cab|dp|cabinet) u(n)?t(u)?k map((p)?ing)?\b|\bxleh slot\b|\btiada slot (u(n)?t(u)?k) (slot|appt|appointment)\b|\bmissing granite info.*(appt|appointment|appmnt)?\b|\bctt.*(tiada|xda|xde) slot\b|\badd id\b|\bskill( )?set\b|\bx( )?k(e)?luar book (appt|appmnt|appointment) time\b|\berr(or)? u(n)?t(u)?k slot(ting)?\b|\b(appt|appointment|appmnt) slot.*err(or)?\b|\b(c|k)ab(inet)? id.*d(a)?l(a)?m tm( )?f(orce)?\b",
-    "TT Missing/ Update Network Details": r"\b(tiada|xda|tidak ada) detail (cab|dp|fdp|fdc)\b|\bmissing (cab|cabinet|fdc|fdpp|cab|dc|dp)( id\/(dp )?(id)?)?\b|\bexchange (sbnr|sebenar)\b|\bbuang (dp|cab|cabinet).*(c)?tt\b|\b(cab|cabinet|dp|fdp) id null\b|\btiada slot.*( appear)?( cab| cabinet)\b|\btiada dp/cabinet detail\b|\bupdate (dp|cab|cabinet) id\b|\bupdate granite\b|\bbantu..tiada kabinet id\b|\b(dp|cab|cabinet) melek(a)?t\b|\badd mapping( zon(e)?)?\b|\bprovide (dp|cab) id\b|\bbantuan add (cab|cabinet|dp)\b|\bmohon( betulk(a)?n)? dp id\b|\bmohon provide cab( ?/dp)? id\b|\b(mohon )?(update|updte|updt) detail (cab|cabinet|fdp|dp)\b|\btiada m(a)?kl(u)?mat network\b|\b(c)?tt( hsba)? xda(a)? (cab(inet)?|(f)?dp) id\b|\b(c)?tt( hsba)? (xd(a)?|tiada) ((f)?dp|cab(inet)?) id\b|\bmohon bantu buang dp id\b|\b((f)?dp|cab(inet)?) id (xd(a|e)?|tiada)\b|\b(cab(inet)?|(f)?dp) (tiada|xd(a|e)) d(a)?l(a)?m list\b|\bbantuan add c(a)?b(i)?(n)?(e)?t( missing| h(i)?l(a)?(n)?g)?.*(primary|secondary)\b|\berr((o)?(r)?|.*) 400\b|\bmohon betul((a)?(k)?(n)?|.*) (k|c)ab(inet)? id\b|\bupdate detail ((f)?dc|(c|k)ab|(c|k)abinet)\b|\bbetul.*building.*((f)?dc|(c|k)ab|(c|k)abinet)\b|\bbantu retrigger cab/dp\b",
-    "TT V1P": r"\b(ctt |tt )?v1p\b|\b(ctt |tt )?whp\b|\bappt @ \d{3,4}(pm|am)?\b|\b(appt|appmnt|appointment)\.\d{1,2}(\.\d{2})?\b|\b(appt|appmnt|appointment)\s+(pkul\s?)?\d{1,2}\.\d{2}\b|\bvip\b|\b(?:ra|appointment|appt|appmnt)\s*\d{1,2}[:.]\d{2}\s*(?:am|pm)?\b|\bslot.*?\b1-2\d{9,11}\b(?!\d)|\b1-2\d{10,11}.*slot.*(?:[01]?\d|2[0-3])[:.]?[0-5]\d(?:[ap]m)?\b|\b(c)?tt.*1-2\d{9,10}\b @|\b(1-2\d{9,10})?( mohon)?(.*ra|.*book).*(1-2\d{9,10})?(am|pm)\b|\b1-2\d{9,10} mohon(.*ra|.*book).*(am|pm)\b|\bb(a)?nt(u)?(a)?n(.*ra|.*book).*(am|pm)( 1-2\d{9,10})\b",
-    "TT CPE Not Tally with Physical": r"\bclose?d\b.*\b(cpe|mesh|wifi|rg|modem|router)\b(?!.*\bnew (rg|router|wifi|mesh|btu|sp|service point)\b|\bs\/?n baru\b)|\b(tak|x)?sama (dengan|dgn) (fizikal|physical|site)\b|\bxbole(h)? close (c)?tt\b|\bs(/)?n onu d(a)?l(a)?m tmf (tak|x) (sma|sama) d(e)?g(a)?n s(/)?n (d)?(e)?kat fizikal\b|\bupd(a)?t(e)?.*(physical|fizikal)\b|\b(tiada|xd(a|e)?).*d(e)?k(a)?t.*site.*ad(a)?\b|\b(pckg|pakej|package).*(ada)?.*(tmf|tmforce).*(xd(a|e)|tiada)\b|\bpremise.*ada.*(tmf|tmforce|tm force).*(tiada|takda|xda|xde)\b|\bmohon update equipment dalam tm( )?force\b|\bc(u)?st(o)?m(e)?r (i)?ni(e)? ada.*d(a)?l(a)?m tm( )?f(orce)? (tiada|xd(a|e)|takda)\b|\bservice point takde onu tak nampak\b|\bx( )?s(a)?m(a)?.*fizikal.*tm( )?f(orce)?\b|\bdekat site.*ada (mesh|rg|wifi|modem|btu|sp|service point)\b|\bs(/)?n.*(tak|x)( )?s(a)?m(a)?.*fizikal.*tm( )?f(orce)?\b",
-    "TT Link LR Appear TMF": r'\bctt link lr appear tmf\b|\b(next )?ntt linkage\b|\bexternal list|ext list\b|\bappear di tmf\b|\bctt under lr\b|\breturn l(a)?ma t(a)?p(i)? m(a)?s(i)?h ada d(a)?l(a)?m (tmf|tm( )?force)\b|\bctt not appear in tm( )?f(orce)? l(e)?p(a)?s (un)?link (ntt|lr)?\b|\bmasih ada di tmf.*lr.*\b|\b(c)?tt link lr\b',
-    "TT Blank Source Skill": r'\b(blank )?source skill( blank)?\b',
-    "ID Locking/ Unlock/ 3rd Attempt": r'\bunlock id\b|\b(pass|pw|password|pwd).*(betul|btl|btul)\b|\b(tak|tk) (boleh|blh) login\b|\b(x|tak|tidak) (dapat|dpt) login\b|\b(?:fail(?:ed)?)\s*(?:log[ -]?in|login|sign[ -]?in|masuk|msk)\b|\bfailed to log in\b|\byour login has been locked after 3 attempts\b|\btmf kena blo(c)?k\b|\bid lock(ed)?\b|\bxbole(h)? login\b|\b(mohon|mhn)\s*(bantuan|bntn|bntuan)\s*(tm\d{5}|q\d{6})\b|\b(tak|x) (blh|boleh) (masuk|msk) tmf\b|\b(x( )?|tak( )?)(boleh|blh).*log( )?in.*tmf\b|\bunlock( )?(semula)?( )?id\b|\bid.*lock(ed)?\b|\b(tidak|tak|x) d(a)?p(a)?t log( )?in\b|\bk(e)?na lock(ed)? 3 attempt fail(ed)?\b|\bxleh log in.*id\b|\b(tidak|x|tak)( )?(boleh|dapat) login tm( )?f(orce)?\b|\b(ui|ru) (tak|x) d(a)?p(a)?t m(a)?s(u)?k tm( )?f(orce)?\b|\bid.*(t(i)?(d)?(a)?k|x).*tm( )?f(orce)?\b|\bid.*(t(a)?k|x) d(a)?p(a)?t login\b|\btm( )?f(orce)?.*lock\b|\b(tidak|x|tak) d(a)?p(a)?t m(a)?s(u)?k tm( )?f(ouce|orce)? mobile\b|\blog( )in fail(ed)?\b|\b(x|tak|tidak) b(o)?l(e)?h.*log( )?in\b|\bg(a)?g(a)?l log( )?in\b',
-    "TT Unsync": r"\bTMF resolv(?:ed)?\b.*\bnova (in[- ]?progress|ip)\b|\bclearkn tmf[.,]?\s*Nova cancelled\b|\bcleark(a)?n tmf\b|\b(c)?tt unlink(ed)? from ntt\b|\bopen.*tm( )?f(orce)?.*nova cancel(led)?\b|\bctt d(a)?l(a)?m nova.*done.*d(a)?l(a)?m tm( )?f(orce)?.*open\b|\bbantu clear( )?(kan)? tm( )?f(orce)?.*nova (cancel(led)?|close(d)?)\b|\btmf open.*icp/next closed\b|\btrigger(k(a)?n)? (c)?tt\b|\b(c)?tt unsync(h)?(ed)?\b|\b(c)?tt.*cancel.*nova.*cancel di tm( )?f(orce)?\b|\bcancel (activity|xtvt|aktiviti|actvty).*(c)?tt\b",
-    "TT Missing": r"\bada (dalam|dlm|dekat|dkt) nova (tapi|tp) (tiada|xda|takda) (dalam|dlm|dekat|dkt) tmf\b|\b(retrigger|trigger) ctt\b|\bada dlm nova tp x de dlm tmf\b|\bctt missing\b|\bctt tiada dalam tmf\b|\bm(o)?h(o)?n (re)?(-)?trigger.*(missing|h(i)?l(a)?(n)?g) d(a)?l(a)?m (act(ivity)?|xtvt|aktiviti) list\b",
-    "TT Update DiagnosisCode": r"\bdiagnosis( missing| unsync)\b|\b(rno|fs) troubleshooting\b",
-    "TT Granite Network Info Error": r"\bcamelia detect data no found\b|\b(tidak|tak|x) dapat pas(s)?( ke)? next\b",
-    "TT HSBA Reappointment": r"\bappt( ctt)? hsba\b",
-    "Resource Management Issue": r"\bsalah zone id\b"
-}
-
-# Ticket/order and ID patterns
-ticket_order_pattern = r'\b1-\d{9,11}\b|\bT-\d{9}\b|\bt-\d{10}\b|\b1-[a-z0-9]{7}\b|\binc\b'
-id_pattern = r'\bQ\d{6}\b|\bq\d{6}\b|\bTM\d{5}\b|\btm\d{5}\b'
+# Build the issue classifier once; Streamlit reuses it across reruns until the patterns change
+@st.cache_resource
+def build_issue_classifier(issue_patterns):
+    return IssueClassifier(issue_patterns)
+
+issue_classifier = build_issue_classifier(issue_patterns)
+
+# Results cache shared by all sessions; set TMF_CACHE_DIR to also keep results on disk across restarts
+@st.cache_resource
+def build_result_cache():
+    return ResultCache(cache_dir=os.environ.get("TMF_CACHE_DIR"))
+
+result_cache = build_result_cache()
+
+# Ticket/ID index shared by all sessions; every processed file's tickets/IDs are added to it
+@st.cache_resource
+def build_ticket_index():
+    return TicketIndex(os.environ.get("TMF_INDEX_PATH", ".tmf_index.sqlite3"))
+
+ticket_index = build_ticket_index()
+
+# Folder with one checkpoint per chat for incremental mode
+checkpoint_dir = os.environ.get("TMF_CHECKPOINT_DIR", ".tmf_checkpoints")
 
 # Dropdown to select between cleaned text from previous step or uploaded file
 data_source = st.radio(
@@ -204,100 +149,137 @@ data_source = st.radio(
 )
 
 # Option to display results separately or combined
-combine_output = st.checkbox("Show combined output for all files -- BUTTON NI ROSAK..JGN PAKAI DULU!")
+combine_output = st.checkbox("Show combined output for all files")
+
+# Incremental mode for cumulative exports: only messages after the last run are read, only new tickets/IDs reported
+incremental = st.checkbox("Incremental mode -- only report tickets/IDs not seen in earlier runs of the same chat (matched by file name)")
+
+# Optional per-category pattern profiling, and a per-message time budget against runaway patterns
+profile_patterns = st.checkbox("Profile issue patterns (per-category call/hit counts and match times)")
+budget_ms = st.number_input("Per-message pattern time budget in ms (0 = no limit); patterns that keep going over it are skipped for the rest of the run",
+                            min_value=0, value=0)
+
+# Number of worker processes; small inputs are always processed serially
+workers = st.number_input("Worker processes", min_value=1, max_value=os.cpu_count() or 1, value=os.cpu_count() or 1)
+
+# Entries shown per page of a results table; only the current page is sent to the browser
+PAGE_SIZE = 100
+
+# Download formats: label, file extension, writer and MIME type
+EXPORT_FORMATS = [
+    ("Text", "txt", write_text, "text/plain"),
+    ("CSV", "csv", write_csv, "text/csv"),
+    ("JSON", "json", write_json, "application/json")
+]
+
+
+# Function to show the download buttons for some results
+def show_downloads(results, base_name, key):
+    for column, (label, extension, write, mime) in zip(st.columns(len(EXPORT_FORMATS)), EXPORT_FORMATS):
+        column.download_button(
+            label=f"Download {label}",
+            data=export_data(write, results),
+            file_name=f"{base_name}.{extension}",
+            mime=mime,
+            key=f"download_{key}_{extension}"
+        )
+
+
+# Function to show one result: a per-issue summary and the entries of the chosen issue, one page at a time
+def show_result(file_name, result):
+    st.dataframe([{"Issue": issue, "Tickets/IDs": result.count(issue)} for issue in result.issues], hide_index=True)
+
+    issue = st.selectbox("Issue", result.issues, key=f"issue_{file_name}")
+    pages = max(1, -(-result.count(issue) // PAGE_SIZE))
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, key=f"page_{file_name}_{issue}")
+
+    start = (page - 1) * PAGE_SIZE
+    rows = [
+        {"Ticket/ID": number, "Message": message} if issue == "Other" else {"Ticket/ID": number}
+        for number, message in result.entries(issue, start, start + PAGE_SIZE)
+    ]
+    st.dataframe(rows, hide_index=True)
+
 
 # Button for processing filtered text messages
 if st.button("Filter text messages"):
-    combined_text = []  # To hold combined output if needed
+    # Profiled or budgeted runs use their own classifier copy and skip the results cache so every message is measured
+    classifier = issue_classifier
+    profiler = None
+    if profile_patterns or budget_ms:
+        profiler = PatternProfiler(issue_classifier.issues, budget_ms / 1000 or None)
+        classifier = issue_classifier.with_profiler(profiler)
+    cache = result_cache if profiler is None else None
+    checkpoints = checkpoint_dir if incremental else None
 
     # If using cleaned text from Step 1
     if data_source == 'Use cleaned text from Step 1':
-        if st.session_state.cleaned_texts:
-            for file_name, cleaned_text in st.session_state.cleaned_texts.items():
-                st.subheader(f"Processing cleaned text from {file_name}")
-                
-                # Process the file content
-                result = process_messages_from_content(cleaned_text, issue_patterns, ticket_order_pattern, id_pattern)
-
-                # Prepare the result text for display
-                result_text = []
-                for issue, data in result.items():
-                    result_text.append(f"Issue: {issue}")
-                    if issue == "Other":
-                        for number, message in data:
-                            result_text.append(f"Ticket/ID: {number}\nMessage: {message}")
-                    else:
-                        result_text.extend([f"{number}" for number in data])
-                    result_text.append("\n")  # Add a newline for separation
-
-                # Join the result text into a single string
-                display_text = "\n".join(result_text)
-
-                # If combining, store the result
-                if combine_output:
-                    combined_text.append(display_text)
-                else:
-                    # Display the result in a read-only text area with normal cursor
-                    st.text_area(f"Results for {file_name}", value=display_text, height=300, disabled=True)
-
-                    # Option to download the result as a text file
-                    st.download_button(
-                        label="Download Results",
-                        data=display_text,
-                        file_name=f"processed_{file_name}",
-                        mime="text/plain"
-                    )
-
+        if st.session_state.cleaned_files:
+            # Process the file contents
+            st.session_state.results = process_uploaded_files(st.session_state.cleaned_files, classifier, ticket_order_pattern, id_pattern, workers, cache, checkpoints, ticket_index)
         else:
             st.warning("No cleaned text available from Step 1. Please process the files first.")
 
     # If using a newly uploaded filtered file
-    elif data_source == 'Upload a new filtered file':
+    elif data_source == 'Upload a new filtered file(s)':
         if uploaded_filtered_files:
-            for uploaded_file in uploaded_filtered_files:
-                file_content = uploaded_file.read().decode("utf-8")
-
-                # Process the file content
-                result = process_messages_from_content(file_content, issue_patterns, ticket_order_pattern, id_pattern)
-
-                # Prepare the result text for display
-                result_text = []
-                for issue, data in result.items():
-                    result_text.append(f"Issue: {issue}")
-                    if issue == "Other":
-                        for number, message in data:
-                            result_text.append(f"Ticket/ID: {number}\nMessage: {message}") 
-                    else: 
-                        result_text.extend([f"{number}" for number in data]) 
-                        result_text.append("\n") # Add a newline for separation
-            # Join the result text into a single string
-            display_text = "\n".join(result_text)
-
-            # If combining, store the result
-            if combine_output:
-                combined_text.append(display_text)
-            else:
-                # Display the result in a read-only text area with normal cursor
-                st.text_area(f"Results for {uploaded_file.name}", value=display_text, height=300, disabled=True)
-
-                # Option to download the result as a text file
-                st.download_button(
-                    label="Download Results",
-                    data=display_text,
-                    file_name=f"processed_{uploaded_file.name}",
-                    mime="text/plain"
-                )
+            # Process the file contents; these files are already filtered, so no sender matcher
+            sources = {uploaded_file.name: (uploaded_file, None) for uploaded_file in uploaded_filtered_files}
+            st.session_state.results = process_uploaded_files(sources, classifier, ticket_order_pattern, id_pattern, workers, cache, checkpoints, ticket_index)
     else:
         st.warning("Please upload at least one text file to process.")
 
-# If combined output is selected, display combined result
-if combine_output and combined_text:
-    combined_result = "\n".join(combined_text)
-    st.subheader("Combined cleaned text")
-    st.text_area("Combined Processed Content", value=combined_result, height=400, disabled=True)
-    st.download_button(
-        label="Download Combined Results",
-        data=combined_result,
-        file_name="combined_processed_result.txt",
-        mime="text/plain"
-    )
+    # Show the pattern profile of this run, and what the time budget skipped
+    if profiler is not None:
+        if profile_patterns:
+            st.subheader("Issue pattern profile")
+            st.dataframe(profiler.rows())
+        if profiler.quarantined:
+            st.warning(f"Patterns of {', '.join(sorted(profiler.quarantined))} kept going over the time budget and were skipped for the rest of the run.")
+        if profiler.flagged_messages:
+            st.warning(f"{profiler.flagged_messages} message(s) had issue patterns skipped by the time budget (examples below), "
+                       "so they may be reported under a later issue or \"Other\".")
+            st.dataframe(
+                [{"Message": example["message"], "Skipped issues": ", ".join(example["skipped_issues"])} for example in profiler.flagged_examples],
+                hide_index=True
+            )
+        if profile_patterns:
+            st.download_button(
+                label="Download pattern profile (JSON)",
+                data=json.dumps(profiler.to_dict(), indent=2),
+                file_name="pattern_profile.json",
+                mime="application/json"
+            )
+
+# Show the latest results; they are kept in session state so paging through them does not reprocess anything
+results = st.session_state.get("results")
+if results:
+    # If combined output is selected, display combined result
+    if combine_output:
+        st.subheader("Combined results")
+        st.dataframe(
+            [{"File": file_name, "Issue": issue, "Tickets/IDs": result.count(issue)} for file_name, result in results.items() for issue in result.issues],
+            hide_index=True
+        )
+        show_downloads(results, "combined_processed_result", "combined")
+    else:
+        for file_name, result in results.items():
+            st.subheader(f"Results for {file_name}")
+            show_result(file_name, result)
+            show_downloads({file_name: result}, f"processed_{os.path.splitext(file_name)[0]}", file_name)
+
+# 3. Section for looking up a ticket/ID in every report generated so far
+st.header("3. Ticket/ID Search")
+
+# The index answers from its own table, so no export is read again
+search_number = st.text_input("Enter a ticket/ID to see every message it appeared in")
+if search_number.strip():
+    occurrences = ticket_index.lookup(search_number)
+    if occurrences:
+        st.caption(f"{len(occurrences)} occurrence(s) in {len({row['file'] for row in occurrences})} file(s)")
+        st.dataframe(
+            [{"Time": row["timestamp"], "Issue": row["issue"], "File": row["file"], "Message #": row["message"]} for row in occurrences],
+            hide_index=True
+        )
+    else:
+        st.info(f"{search_number.strip()} is not in any report generated so far.")
@@ -0,0 +1,86 @@
+import io
+import random
+
+from tmf_reporter import DEFAULT_BASE_NAMES, SenderMatcher, detect_encoding, iter_file_blocks, iter_file_messages, parse_base_names
+from tmf_reporter.engine import (
+    _byte_patterns,
+    _ticket_prefilter,
+    iter_filtered_blocks,
+    iter_messages,
+    message_split_pattern,
+)
+from tmf_reporter.patterns import id_pattern, ticket_order_pattern
+
+# Exports in ASCII-compatible encodings are split as bytes; these tests check the byte scanner against
+# the plain text path (decode, splitlines, re.split) on random exports in several encodings and line breaks.
+
+LINE_BREAKS = ['\n'] * 20 + ['\r\n'] * 5 + ['\r', '\x0c', '\x85', '\x1c', '\x0b', ' ']
+WORDS = [
+    'hello', 'tina', 'Hartina', 'los', 'down', '1-123456789', 'T-123456789', 'Q123456', 'tm12345', 'inc', 'é', '😀',
+    'fibre cut', 'full capping', '[12:30, 1/2/2024]', '[1/2/2024 9 am]', '\n[1/2/2024 9 am] x', 'Qé123456'
+]
+ENCODINGS = ['utf-8', 'utf-8-sig', 'cp1252', 'latin-1', 'utf-16']
+
+
+def random_header(rng):
+    return rng.choice([
+        '[%02d:%02d, %d/%d/2024] ' % (rng.randrange(24), rng.randrange(60), rng.randint(1, 28), rng.randint(1, 12)),
+        '[%d/%d/2024 %d:%02d %s] ' % (rng.randint(1, 28), rng.randint(1, 12), rng.randint(1, 12), rng.randrange(60), rng.choice(['AM', 'PM'])),
+        '[1/2/2024 9 am] ',
+        ''
+    ])
+
+
+# Function to make a random export mixing header forms, senders, tickets/IDs, non-ASCII text and line breaks
+def random_export(rng):
+    lines = []
+    for _ in range(rng.randint(0, 30)):
+        sender = rng.choice(['Tina: ', 'Ali: ', 'Wan : ', '', 'Someone Tina: '])
+        words = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(0, 8)))
+        lines.append(random_header(rng) + sender + words + rng.choice(LINE_BREAKS))
+    return ''.join(lines)
+
+
+# Function to yield (encoded export, decoded text) pairs for the encodings a random export can be written in
+def iter_encoded_exports(count, seed):
+    rng = random.Random(seed)
+    for _ in range(count):
+        text = random_export(rng)
+        for encoding in ENCODINGS:
+            try:
+                data = text.encode(encoding)
+            except UnicodeEncodeError:
+                continue
+            yield data, data.decode(detect_encoding(io.BytesIO(data)), "replace")
+
+
+def test_ascii_compatible_encodings_are_scanned_as_bytes():
+    for encoding in ['utf-8', 'utf-8-sig', 'cp1252', 'latin-1']:
+        assert _byte_patterns(encoding) is not None
+    assert _byte_patterns('utf-16') is None
+
+
+def test_blocks_match_text_path():
+    sender_matcher = SenderMatcher(parse_base_names(DEFAULT_BASE_NAMES))
+    for data, text in iter_encoded_exports(150, 1):
+        expected = list(iter_filtered_blocks(text.splitlines(), sender_matcher))
+        assert list(iter_file_blocks(io.BytesIO(data), sender_matcher)) == expected, text
+
+
+def test_messages_match_text_path():
+    prefilter = _ticket_prefilter(ticket_order_pattern, id_pattern)
+    for data, text in iter_encoded_exports(150, 2):
+        expected = message_split_pattern.split(text)
+        assert list(iter_file_messages(io.BytesIO(data))) == expected, text
+
+        # Messages the prefilter skips come out as '' and cannot hold tickets/IDs
+        prefiltered = list(iter_file_messages(io.BytesIO(data), prefilter=prefilter))
+        assert len(prefiltered) == len(expected)
+        for got, message in zip(prefiltered, expected):
+            assert got == message or (got == '' and not prefilter.search(message.encode("utf-8"))), text
+
+
+def test_message_headers_match_text_path():
+    for data, text in iter_encoded_exports(150, 3):
+        expected = list(iter_messages(text.split('\n'), with_headers=True))
+        assert list(iter_file_messages(io.BytesIO(data), with_headers=True)) == expected, text
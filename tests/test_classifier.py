@@ -0,0 +1,58 @@
+import random
+import re
+
+from benchmarks.generate import CHATTER, ISSUE_SAMPLES
+from tmf_reporter import IssueClassifier, issue_patterns
+
+# IssueClassifier skips patterns using literals taken from re's private parse tree; these tests check
+# it still picks exactly what plain re.search() in dict order picks, so a parser change cannot go unnoticed.
+
+PHRASES = [phrase for phrases in ISSUE_SAMPLES.values() for phrase in phrases] + CHATTER
+EXTRA_WORDS = ["1-123456789", "Q123456", "TM12345", "é", "😀", "\n", "[12:30, 1/2/2024]", "ORDER", "Tak", "x"]
+
+
+# Function to classify a message the slow, obvious way
+def reference_classify(message):
+    for issue, pattern in issue_patterns.items():
+        if re.search(pattern, message, re.IGNORECASE):
+            return issue
+    return None
+
+
+# Function to make a random message from phrases, phrase fragments and other words, in mixed case
+def random_message(rng):
+    words = []
+    for _ in range(rng.randint(0, 6)):
+        phrase = rng.choice(PHRASES)
+        kind = rng.randrange(4)
+        if kind == 0:
+            phrase = phrase.upper()
+        elif kind == 1:
+            start = rng.randrange(len(phrase))
+            phrase = phrase[start:start + rng.randint(1, 12)]
+        words.append(phrase)
+        if rng.random() < 0.3:
+            words.append(rng.choice(EXTRA_WORDS))
+    return " ".join(words)
+
+
+def test_classify_matches_re_search_on_samples():
+    classifier = IssueClassifier(issue_patterns)
+    for phrase in PHRASES:
+        for message in (phrase, phrase.upper(), f"mohon bantu {phrase} é"):
+            assert classifier.classify(message) == reference_classify(message), message
+
+
+def test_classify_matches_re_search_on_random_text():
+    classifier = IssueClassifier(issue_patterns)
+    rng = random.Random(0)
+    for _ in range(3000):
+        message = random_message(rng)
+        assert classifier.classify(message) == reference_classify(message), message
+
+
+def test_every_sample_classifies_into_its_issue():
+    classifier = IssueClassifier(issue_patterns)
+    for issue, phrases in ISSUE_SAMPLES.items():
+        for phrase in phrases:
+            assert classifier.classify(phrase) == issue, phrase
@@ -0,0 +1,133 @@
+import io
+import re
+import sqlite3
+
+from benchmarks.generate import iter_export_lines
+from tmf_reporter import (
+    DEFAULT_BASE_NAMES,
+    IssueClassifier,
+    ResultCache,
+    SenderMatcher,
+    TicketIndex,
+    filter_messages,
+    id_pattern,
+    issue_patterns,
+    parse_base_names,
+    process_uploaded_files,
+    ticket_order_pattern,
+)
+from tmf_reporter import engine
+from tmf_reporter.engine import message_split_capture_pattern, message_timestamp
+
+# Index rows must not depend on how a file was read: in one go, in parallel, or incrementally over growing
+# cumulative exports. They are checked against positions and times taken straight from the split text.
+
+SENDER_MATCHER = SenderMatcher(parse_base_names(DEFAULT_BASE_NAMES))
+CLASSIFIER = IssueClassifier(issue_patterns)
+EXPORT_LINES = list(iter_export_lines(3000, seed=5))
+
+
+def export_bytes(lines):
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def index_rows(index):
+    with sqlite3.connect(index.path) as connection:
+        return {(number.lower(), *rest) for number, *rest in connection.execute("SELECT * FROM occurrences")}
+
+
+# Function to get the rows an index should hold for some cleaned text, from a plain split of it
+def reference_rows(text, file_name):
+    parts = message_split_capture_pattern.split(text)
+    messages = [('', parts[0])] + [(parts[i] if parts[i] != '\n' else '', parts[i + 1]) for i in range(1, len(parts), 2)]
+    rows = set()
+    for position, (header, message) in enumerate(messages):
+        numbers = re.findall(ticket_order_pattern, message) + re.findall(id_pattern, message)
+        issue = CLASSIFIER.classify(message) or "Other"
+        rows.update((number.lower(), file_name, position, message_timestamp(header, message), issue) for number in numbers)
+    return rows
+
+
+def process(sources, index, **options):
+    return process_uploaded_files(sources, CLASSIFIER, ticket_order_pattern, id_pattern, 1, index=index, **options)
+
+
+def test_full_run_matches_reference(tmp_path):
+    data = export_bytes(EXPORT_LINES)
+    cleaned = filter_messages({"chat.txt": io.BytesIO(data)}, SENDER_MATCHER)["chat.txt"]
+    expected = reference_rows(cleaned, "chat.txt")
+    assert expected
+
+    raw_index = TicketIndex(str(tmp_path / "raw.sqlite3"))
+    process({"chat.txt": (io.BytesIO(data), SENDER_MATCHER)}, raw_index)
+    assert index_rows(raw_index) == expected
+
+    cleaned_index = TicketIndex(str(tmp_path / "cleaned.sqlite3"))
+    process({"chat.txt": (io.BytesIO(cleaned.encode("utf-8")), None)}, cleaned_index)
+    assert index_rows(cleaned_index) == expected
+
+
+def test_incremental_positions_match_full_run(tmp_path):
+    for sender_matcher in (SENDER_MATCHER, None):
+        full_index = TicketIndex(str(tmp_path / f"full_{sender_matcher is None}.sqlite3"))
+        incremental_index = TicketIndex(str(tmp_path / f"incremental_{sender_matcher is None}.sqlite3"))
+        checkpoint_dir = str(tmp_path / f"checkpoints_{sender_matcher is None}")
+
+        # Each export extends the previous one, as daily cumulative exports do
+        for end in (400, 1100, 1101, 2500, len(EXPORT_LINES)):
+            path = tmp_path / "chat.txt"
+            path.write_bytes(export_bytes(EXPORT_LINES[:end]))
+            with open(path, "rb") as file_data:
+                process({"chat.txt": (file_data, sender_matcher)}, incremental_index, checkpoint_dir=checkpoint_dir)
+
+        with open(tmp_path / "chat.txt", "rb") as file_data:
+            process({"chat.txt": (file_data, sender_matcher)}, full_index)
+
+        assert index_rows(incremental_index) == index_rows(full_index)
+
+
+def test_renamed_export_is_indexed_despite_cache_hit(tmp_path):
+    data = export_bytes(EXPORT_LINES[:500])
+    index = TicketIndex(str(tmp_path / "index.sqlite3"))
+    cache = ResultCache()
+
+    process({"monday.txt": (io.BytesIO(data), SENDER_MATCHER)}, index, cache=cache)
+    process({"tuesday.txt": (io.BytesIO(data), SENDER_MATCHER)}, index, cache=cache)
+
+    files = {row[1] for row in index_rows(index)}
+    assert files == {"monday.txt", "tuesday.txt"}
+
+
+def test_lookup_ignores_case(tmp_path):
+    index = TicketIndex(str(tmp_path / "index.sqlite3"))
+    records = [("Bypass HSI", ["1-123456789"], ["Q123456"], None, 7, "2024-02-01 09:30")]
+    assert list(index.add_records("chat.txt", records)) == records
+
+    expected = [{"file": "chat.txt", "message": 7, "timestamp": "2024-02-01 09:30", "issue": "Bypass HSI"}]
+    assert index.lookup("q123456") == expected
+    assert index.lookup(" Q123456 ") == expected
+    assert index.lookup("Q654321") == []
+
+
+def test_parallel_run_matches_serial(tmp_path, monkeypatch):
+    # Small thresholds so a test-sized export is split into many chunks across two workers
+    monkeypatch.setattr(engine, "PARALLEL_MIN_BYTES", 1000)
+    monkeypatch.setattr(engine, "PARALLEL_CHUNK_CHARS", 5000)
+
+    data = export_bytes(EXPORT_LINES)
+    cleaned = filter_messages({"chat.txt": io.BytesIO(data)}, SENDER_MATCHER)["chat.txt"].encode("utf-8")
+
+    for with_index in (False, True):
+        results = {}
+        for workers in (1, 2):
+            index = TicketIndex(str(tmp_path / f"index_{with_index}_{workers}.sqlite3")) if with_index else None
+            sources = {
+                "raw.txt": (io.BytesIO(data), SENDER_MATCHER),
+                "cleaned.txt": (io.BytesIO(cleaned), None),
+                "short.txt": (io.BytesIO(export_bytes(EXPORT_LINES[:40])), SENDER_MATCHER),
+            }
+            result = process_uploaded_files(sources, CLASSIFIER, ticket_order_pattern, id_pattern, workers, index=index)
+            results[workers] = (result, index and index_rows(index))
+
+        assert results[2] == results[1]
+        assert all(result.total() for result in results[1][0].values())
@@ -0,0 +1,63 @@
+import time
+
+from tmf_reporter import IssueClassifier, PatternProfiler, issue_patterns
+
+# Python's re cannot stop a running search, so the time budget must keep a runaway pattern from being
+# searched again: it may cost a few searches per run, never one per message.
+
+# "TT V1P" backtracks heavily on this message (about 0.15 s here, growing fast with the repeat count)
+SLOW_MESSAGE = "tt " + "ra book x " * 40
+
+
+def profiled_classifier(**options):
+    profiler = PatternProfiler(list(issue_patterns), **options)
+    return IssueClassifier(issue_patterns).with_profiler(profiler), profiler
+
+
+def test_runaway_pattern_is_quarantined():
+    classifier, profiler = profiled_classifier(message_budget=0.01)
+
+    start = time.perf_counter()
+    classifier.classify(SLOW_MESSAGE)
+    first = time.perf_counter() - start
+    assert "TT V1P" in profiler.quarantined
+
+    start = time.perf_counter()
+    for _ in range(5):
+        classifier.classify(SLOW_MESSAGE)
+    assert time.perf_counter() - start < first
+
+    stats = profiler.stats["TT V1P"]
+    assert stats["calls"] == 1 and stats["skipped"] == 5
+    assert profiler.flagged_messages == 5
+    assert next(row for row in profiler.rows() if row["Issue"] == "TT V1P")["Quarantined"]
+
+
+def test_quarantine_after_repeated_overruns():
+    # Every search goes over a tiny budget but never by the factor, so only the overrun count quarantines
+    profiler = PatternProfiler(["TT V1P"], message_budget=1e-12, quarantine_after=3, quarantine_factor=1e15)
+    classifier = IssueClassifier({"TT V1P": issue_patterns["TT V1P"]}).with_profiler(profiler)
+    message = "ctt v1p mohon bantu"
+
+    for _ in range(2):
+        assert classifier.classify(message) == "TT V1P"
+    assert "TT V1P" not in profiler.quarantined
+
+    classifier.classify(message)
+    assert "TT V1P" in profiler.quarantined
+    assert classifier.classify(message) is None
+    assert profiler.stats["TT V1P"]["calls"] == 3
+
+
+def test_quarantine_survives_take_and_merge():
+    classifier, profiler = profiled_classifier(message_budget=0.01)
+    classifier.classify(SLOW_MESSAGE)
+
+    taken = profiler.take()
+    assert taken["quarantined"] == ["TT V1P"]
+    assert profiler.quarantined == {"TT V1P"}
+
+    parent = PatternProfiler(list(issue_patterns), message_budget=0.01)
+    parent.merge(taken)
+    assert parent.quarantined == {"TT V1P"}
+    assert parent.stats["TT V1P"]["calls"] == 1
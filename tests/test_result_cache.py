@@ -0,0 +1,77 @@
+import io
+import os
+import shutil
+
+from tmf_reporter import (
+    DEFAULT_BASE_NAMES,
+    CompactResult,
+    IssueClassifier,
+    ResultCache,
+    SenderMatcher,
+    id_pattern,
+    issue_patterns,
+    parse_base_names,
+    result_cache_key,
+    ticket_order_pattern,
+)
+
+# A cached result is only reused for the same bytes and the same settings, so every setting
+# that shapes a result must change the key; and a cache folder that cannot be written must not fail a run.
+
+BASE_NAMES = parse_base_names(DEFAULT_BASE_NAMES)
+DATA = b"[12:30, 1/2/2024] Ali: ctt v1p mohon bantu 1-123456789\n"
+
+
+def key(base_names=BASE_NAMES, patterns=issue_patterns, ticket_pattern=ticket_order_pattern, number_pattern=id_pattern, data=DATA):
+    sender_matcher = None if base_names is None else SenderMatcher(base_names)
+    return result_cache_key(io.BytesIO(data), sender_matcher, IssueClassifier(patterns), ticket_pattern, number_pattern)
+
+
+def test_key_changes_with_every_setting():
+    issue, pattern = next(iter(issue_patterns.items()))
+    edited_pattern = dict(issue_patterns, **{issue: pattern + "|extra"})
+    renamed_issue = {(issue + " 2" if name == issue else name): value for name, value in issue_patterns.items()}
+    reordered = dict(reversed(list(issue_patterns.items())))
+
+    keys = [
+        key(),
+        key(base_names=BASE_NAMES[:-1]),
+        key(base_names=BASE_NAMES + ["Someone"]),
+        key(base_names=None),
+        key(patterns=edited_pattern),
+        key(patterns=renamed_issue),
+        key(patterns=reordered),
+        key(ticket_pattern=ticket_order_pattern + "x"),
+        key(number_pattern=id_pattern + "x"),
+        key(data=DATA + b"ok\n"),
+    ]
+    assert len(set(keys)) == len(keys)
+    assert key() == keys[0]
+
+
+def sample_result():
+    result = CompactResult()
+    result.add("TT V1P", ["1-123456789"])
+    return result
+
+
+def test_put_survives_missing_cache_dir(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache = ResultCache(cache_dir=str(cache_dir))
+    shutil.rmtree(cache_dir)
+
+    cache.put("key", sample_result())
+    assert cache.get("key") == sample_result()
+
+
+def test_put_removes_temp_file_on_failure(tmp_path, monkeypatch):
+    cache = ResultCache(cache_dir=str(tmp_path))
+
+    def fail_replace(source, target):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail_replace)
+    cache.put("key", sample_result())
+
+    assert os.listdir(tmp_path) == []
+    assert cache.get("key") == sample_result()
@@ -0,0 +1,74 @@
+import random
+import re
+
+from tmf_reporter import SenderMatcher
+from tmf_reporter.engine import iter_filtered_blocks, timestamp_pattern
+
+# SenderMatcher folds all base names into one trie regex; these tests check it against the original
+# one-regex-per-name check (rf'\b{re.escape(name)}\b', case-insensitive) applied to the sender part of the header.
+
+NAMES = ['Dhef', 'Dheffirdaus', 'Wan', 'Eliasaph Wan', 'A.B (C)', 'x+y', 'Tina', 'tina', 'ÉLODIE', 'ß', 'Jo$', '[Ops]']
+SENDERS = [
+    'Dhef', 'Dheffirdaus', 'Dheffi', 'dhef', 'DHEFFIRDAUS', 'Wan', 'wan', 'Wanda', 'Eliasaph Wan', 'Eliasaph Wang',
+    'Eliasaph', 'A.B (C)', 'AxB (C)', 'a.b (c)', 'x+y', 'xxy', 'X+Y', 'Hartina', 'Tina', 'TINA', 'élodie', 'Élodie',
+    'SS', 'ß', 'Jo$', 'Jo', '[Ops]', 'Ops', 'Ali', '+62 812-3456-7890', ''
+]
+HEADERS = ['[12:30, 1/2/2024] ', '[1/2/2024 9:05 AM] ']
+
+
+# Function to tell whether a header line names an excluded sender, one regex per name
+def reference_matches(line, names):
+    sender_start = timestamp_pattern.match(line).end()
+    sender_end = line.find(': ', sender_start)
+    sender_end = len(line) if sender_end == -1 else sender_end + 2
+
+    for name in names:
+        match = re.search(rf'\b{re.escape(name)}\b', line, re.IGNORECASE)
+        if match and match.start() < sender_end:
+            return True
+    return False
+
+
+def random_line(rng):
+    sender = ' '.join(rng.choice(SENDERS) for _ in range(rng.randint(1, 2)))
+    body = ' '.join(rng.choice(SENDERS + ['please check', ':', ': ', 'ok']) for _ in range(rng.randint(0, 4)))
+    return rng.choice(HEADERS) + sender + rng.choice([': ', ':', ' : ', '']) + body
+
+
+def test_matches_per_name_regex():
+    rng = random.Random(3)
+    for _ in range(300):
+        names = rng.sample(NAMES, rng.randint(0, len(NAMES)))
+        matcher = SenderMatcher(names)
+        for _ in range(20):
+            line = random_line(rng)
+            sender_start = timestamp_pattern.match(line).end()
+            assert matcher.matches(line, sender_start) == reference_matches(line, names), (names, line)
+
+
+def test_prefix_names_metacharacters_and_case():
+    names = ['Dhef', 'Dheffirdaus', 'Wan', 'Eliasaph Wan', 'A.B (C) x', 'x+y']
+    matcher = SenderMatcher(names)
+    header = '[12:30, 1/2/2024] '
+
+    for sender in ['Dhef', 'dheffirdaus', 'Eliasaph Wan', 'eliasaph wan', 'WAN', 'A.B (C) x', 'a.b (c) X', 'x+y']:
+        line = header + sender + ': hi'
+        assert matcher.matches(line, len(header)) and reference_matches(line, names), sender
+    for sender in ['Dheffi', 'Wanda', 'AxB (C) x', 'xxy', 'x+yz']:
+        line = header + sender + ': hi'
+        assert not matcher.matches(line, len(header)) and not reference_matches(line, names), sender
+
+
+def test_name_in_body_keeps_block():
+    matcher = SenderMatcher(['Tina', 'Wan'])
+    lines = [
+        '[12:30, 1/2/2024] Ali: tina please check 1-123456789',
+        'wan too',
+        '[12:31, 1/2/2024] Tina: done',
+        '[1/2/2024 9:05 AM] Budi: ok Wan',
+    ]
+
+    assert list(iter_filtered_blocks(lines, matcher)) == [
+        '[12:30, 1/2/2024] ali: tina please check 1-123456789 wan too',
+        '[1/2/2024 9:05 am] budi: ok wan',
+    ]
@@ -0,0 +1,68 @@
+# TMF daily report engine: chat-export cleaning and issue classification without any UI dependency.
+# The Streamlit app (streamlit_app.py) and the batch CLI (python -m tmf_reporter) are both built on it.
+
+from .engine import (
+    IssueClassifier,
+    PatternProfiler,
+    ResultCache,
+    SenderMatcher,
+    classify_messages,
+    detect_encoding,
+    filter_messages,
+    iter_file_blocks,
+    iter_file_lines,
+    iter_file_messages,
+    iter_filtered_blocks,
+    iter_message_records,
+    iter_messages,
+    load_checkpoint,
+    merge_message_records,
+    parse_base_names,
+    process_incremental,
+    process_messages_from_content,
+    process_uploaded_file,
+    process_uploaded_files,
+    result_cache_key,
+    save_checkpoint,
+    write_cleaned_text,
+)
+from .index import TicketIndex
+from .patterns import DEFAULT_BASE_NAMES, id_pattern, issue_patterns, ticket_order_pattern
+from .report import CompactResult, format_result, iter_result_text, write_csv, write_json, write_text
+
+__all__ = [
+    "CompactResult",
+    "DEFAULT_BASE_NAMES",
+    "IssueClassifier",
+    "PatternProfiler",
+    "ResultCache",
+    "SenderMatcher",
+    "TicketIndex",
+    "classify_messages",
+    "detect_encoding",
+    "filter_messages",
+    "format_result",
+    "id_pattern",
+    "issue_patterns",
+    "iter_file_blocks",
+    "iter_file_lines",
+    "iter_file_messages",
+    "iter_filtered_blocks",
+    "iter_message_records",
+    "iter_messages",
+    "iter_result_text",
+    "load_checkpoint",
+    "merge_message_records",
+    "parse_base_names",
+    "process_incremental",
+    "process_messages_from_content",
+    "process_uploaded_file",
+    "process_uploaded_files",
+    "result_cache_key",
+    "save_checkpoint",
+    "ticket_order_pattern",
+    "write_cleaned_text",
+    "write_csv",
+    "write_json",
+    "write_text",
+]
@@ -0,0 +1,150 @@
+import argparse
+import glob
+import os
+import sys
+
+from .engine import (
+    IssueClassifier,
+    PatternProfiler,
+    ResultCache,
+    SenderMatcher,
+    parse_base_names,
+    process_uploaded_files,
+    write_cleaned_text,
+)
+from .index import TicketIndex
+from .patterns import DEFAULT_BASE_NAMES, id_pattern, issue_patterns, ticket_order_pattern
+from .report import write_csv, write_json, write_text
+
+# Headless batch mode, e.g. from cron:
+#   python -m tmf_reporter exports/ --output-dir reports/
+# writes processed_<file> per export plus combined_processed_result.txt, the same reports the app offers,
+# and optionally combined_processed_result.csv/.json. With --index, ticket/ID occurrences are added to an index
+# that can be queried later without reading the exports again:
+#   python -m tmf_reporter --index tickets.sqlite3 --find 1-123456789
+# --budget-ms guards against runaway issue patterns and --profile-json writes per-pattern statistics:
+#   python -m tmf_reporter exports/ --budget-ms 200 --profile-json pattern_profile.json
+
+
+# Function to expand the given files and directories into a sorted list of export paths
+def find_exports(paths, pattern):
+    exports = []
+    for path in paths:
+        if os.path.isdir(path):
+            exports.extend(sorted(glob.glob(os.path.join(path, pattern))))
+        else:
+            exports.append(path)
+    return exports
+
+
+# Function to write the cleaned text of a raw export (the app's Step 1 download) without holding it in memory
+def write_cleaned(file_data, sender_matcher, path):
+    with open(path, "w", encoding="utf-8") as cleaned_file:
+        write_cleaned_text(file_data, sender_matcher, cleaned_file)
+
+
+# Function to print every indexed occurrence of some tickets/IDs, one per line
+def print_occurrences(index, numbers):
+    for number in numbers:
+        occurrences = index.lookup(number)
+        print(f"{number}: {len(occurrences)} occurrence(s)")
+        for occurrence in occurrences:
+            print(f"  {occurrence['timestamp'] or '-'}  {occurrence['issue']}  {occurrence['file']} (message {occurrence['message']})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m tmf_reporter", description="Generate TMF daily reports from chat exports.")
+    parser.add_argument("inputs", nargs="*", help="export files and/or directories of exports")
+    parser.add_argument("--output-dir", "-o", default="reports", help="where to write the reports (default: reports)")
+    parser.add_argument("--glob", default="*.txt", help="file pattern used inside input directories (default: *.txt)")
+    parser.add_argument("--base-names", default=DEFAULT_BASE_NAMES, help="comma-separated senders to remove")
+    parser.add_argument("--filtered", action="store_true", help="inputs are already filtered (skip sender filtering)")
+    parser.add_argument("--cleaned", action="store_true", help="also write cleaned_<file> for raw exports")
+    parser.add_argument("--no-combined", action="store_true", help="do not write combined_processed_result.txt")
+    parser.add_argument("--csv", action="store_true", help="also write combined_processed_result.csv")
+    parser.add_argument("--json", action="store_true", help="also write combined_processed_result.json")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes (default: all CPUs)")
+    parser.add_argument("--cache-dir", default=os.environ.get("TMF_CACHE_DIR"), help="on-disk results cache (default: $TMF_CACHE_DIR)")
+    parser.add_argument("--incremental", action="store_true", help="only report tickets/IDs not seen in earlier runs of each chat")
+    parser.add_argument("--checkpoint-dir", default=os.environ.get("TMF_CHECKPOINT_DIR", ".tmf_checkpoints"),
+                        help="checkpoints for --incremental (default: $TMF_CHECKPOINT_DIR or .tmf_checkpoints)")
+    parser.add_argument("--index", default=os.environ.get("TMF_INDEX_PATH"),
+                        help="ticket/ID index to add occurrences to and search (default: $TMF_INDEX_PATH)")
+    parser.add_argument("--find", action="append", default=[], metavar="TICKET_ID",
+                        help="print the indexed occurrences of a ticket/ID, after processing any inputs (repeatable)")
+    parser.add_argument("--budget-ms", type=float, default=0,
+                        help="per-message issue pattern time budget; patterns that keep going over it are skipped for the rest of the run (default: no limit)")
+    parser.add_argument("--profile-json", metavar="PATH", help="write per-pattern call/hit counts and match times as JSON")
+    args = parser.parse_args(argv)
+
+    if not args.inputs and not args.find:
+        parser.error("give export files/directories and/or --find")
+    if args.find and not args.index:
+        parser.error("--find needs --index or $TMF_INDEX_PATH")
+    index = TicketIndex(args.index) if args.index else None
+
+    if not args.inputs:
+        print_occurrences(index, args.find)
+        return 0
+
+    exports = find_exports(args.inputs, args.glob)
+    if not exports:
+        print("No export files found.", file=sys.stderr)
+        return 2
+
+    # Reports are named after the export, so two exports with the same file name would overwrite each other
+    names = [os.path.basename(path) for path in exports]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        print(f"Several exports share the file name(s): {', '.join(duplicates)}", file=sys.stderr)
+        return 2
+
+    sender_matcher = None if args.filtered else SenderMatcher(parse_base_names(args.base_names))
+    classifier = IssueClassifier(issue_patterns)
+
+    # Profiled or budgeted runs use their own classifier copy and skip the results cache so every message is measured
+    profiler = None
+    if args.profile_json or args.budget_ms:
+        profiler = PatternProfiler(classifier.issues, args.budget_ms / 1000 or None)
+        classifier = classifier.with_profiler(profiler)
+    cache = ResultCache(cache_dir=args.cache_dir) if args.cache_dir and not args.incremental and profiler is None else None
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    files = {name: open(path, "rb") for name, path in zip(names, exports)}
+    try:
+        if args.cleaned and sender_matcher is not None:
+            for name, file_data in files.items():
+                write_cleaned(file_data, sender_matcher, os.path.join(args.output_dir, f"cleaned_{name}"))
+
+        sources = {name: (file_data, sender_matcher) for name, file_data in files.items()}
+        results = process_uploaded_files(sources, classifier, ticket_order_pattern, id_pattern, args.workers, cache,
+                                         args.checkpoint_dir if args.incremental else None, index)
+    finally:
+        for file_data in files.values():
+            file_data.close()
+
+    for name, result in results.items():
+        with open(os.path.join(args.output_dir, f"processed_{name}"), "w", encoding="utf-8") as report_file:
+            write_text({name: result}, report_file)
+
+        found_issues = sum(1 for issue in result.issues if result.count(issue))
+        print(f"{name}: {result.total()} ticket(s)/ID(s) in {found_issues} issue(s)")
+
+    # Combined reports are streamed from the results, never built as one string
+    writers = [("txt", write_text, not args.no_combined), ("csv", write_csv, args.csv), ("json", write_json, args.json)]
+    for extension, write, enabled in writers:
+        if enabled:
+            with open(os.path.join(args.output_dir, f"combined_processed_result.{extension}"), "w", encoding="utf-8", newline="") as combined_file:
+                write(results, combined_file)
+
+    if profiler is not None:
+        if profiler.quarantined:
+            print(f"Skipped for the rest of the run after going over the time budget: {', '.join(sorted(profiler.quarantined))}", file=sys.stderr)
+        if profiler.flagged_messages:
+            print(f"{profiler.flagged_messages} message(s) had issue patterns skipped; they may be reported under a later issue or \"Other\"",
+                  file=sys.stderr)
+        if args.profile_json:
+            profiler.dump(args.profile_json)
+
+    print_occurrences(index, args.find)
+    return 0
@@ -0,0 +1,1125 @@
+import codecs
+import copy
+import hashlib
+import io
+import itertools
+import json
+import mmap
+import os
+import re
+import time
+from collections import OrderedDict, deque
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+from .report import CompactResult
+
+# Cleaning and classification engine behind the Streamlit app and the batch CLI; it never imports Streamlit.
+
+
+# Timestamp header that starts a new message block in a raw chat export
+timestamp_pattern = re.compile(r'\[\d{2}:\d{2}, \d{1,2}/\d{1,2}/\d{4}\]|^\[\d{1,2}/\d{1,2}/\d{4} \d{1,2}:\d{2} [APM]{2}]')
+
+# 24-hour header, the only one that both starts a block and splits messages for classification
+message_start_pattern = re.compile(r'\[\d{2}:\d{2}, \d{1,2}/\d{1,2}/\d{4}\]')
+
+# Boundaries used to split cleaned/filtered text into messages for classification
+message_split_pattern = re.compile(r'\n(?=\[\d{1,2}/\d{1,2}/\d{4} \d{1,2} (?:am|pm)\])|\[\d{2}:\d{2}, \d{1,2}/\d{1,2}/\d{4}\]')
+
+# The same boundaries kept in the split result, so the 24-hour header each message started with is known
+message_split_capture_pattern = re.compile(f'({message_split_pattern.pattern})')
+
+# Message times for the ticket/ID index: the 24-hour header a message was split at, or the 12-hour one it starts with
+# (both day first, as in the exports this app handles)
+header_time_pattern = re.compile(r'\[(\d{2}):(\d{2}), (\d{1,2})/(\d{1,2})/(\d{4})\]')
+message_time_pattern = re.compile(r'\s*\[(\d{1,2})/(\d{1,2})/(\d{4}) (\d{1,2})(?::(\d{2}))? ([ap]m)\]', re.IGNORECASE)
+
+# Byte versions of the patterns above, for scanning ASCII-compatible exports without decoding them.
+# The header one is timestamp_pattern after its opening '['; _byte_patterns anchors it to line starts per encoding.
+timestamp_bytes_pattern = rb'(?:\d{2}:\d{2}, \d{1,2}/\d{1,2}/\d{4}\]|\d{1,2}/\d{1,2}/\d{4} \d{1,2}:\d{2} [APM]{2}])'
+message_split_bytes_pattern = re.compile(message_split_pattern.pattern.encode("ascii"))
+
+# Characters str.splitlines() breaks lines on
+LINE_BREAKS = '\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029'
+
+# Bytes read from the start of a file to detect its encoding; detected encodings are cached per sample
+ENCODING_SAMPLE_BYTES = 64 * 1024
+ENCODING_CACHE_SIZE = 256
+_encoding_cache = OrderedDict()
+
+# Compiled byte patterns per encoding (None for encodings that cannot be scanned as bytes)
+_byte_pattern_cache = {}
+
+
+# Function to detect the encoding of a sample of bytes: BOMs first, then UTF-8 (which covers ASCII),
+# then chardet when it is installed, and finally latin-1, which decodes anything
+def _detect_sample_encoding(sample, truncated):
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if sample.startswith((codecs.BOM_UTF32_LE, codecs.BOM_UTF32_BE)):
+        return "utf-32"
+    if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+
+    try:
+        # A truncated sample may end in the middle of a character
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=not truncated)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+
+    # chardet is slow to import and only needed for files that are not UTF-8, so it is imported here
+    try:
+        import chardet
+    except ImportError:
+        return "latin-1"
+
+    detected = chardet.detect(sample)["encoding"]
+    try:
+        return codecs.lookup(detected).name if detected else "latin-1"
+    except LookupError:
+        return "latin-1"
+
+
+# Function to detect the encoding of an uploaded file from a sample of its first bytes, without moving its position
+def detect_encoding(file_data, sample_bytes=ENCODING_SAMPLE_BYTES):
+    position = file_data.tell()
+    file_data.seek(0)
+    sample = file_data.read(sample_bytes)
+    file_data.seek(position)
+
+    # Cumulative exports of the same chat share their first bytes, so later runs hit the cache
+    truncated = len(sample) == sample_bytes
+    key = (hashlib.sha256(sample).digest(), truncated)
+    if key in _encoding_cache:
+        _encoding_cache.move_to_end(key)
+        return _encoding_cache[key]
+
+    encoding = _detect_sample_encoding(sample, truncated)
+    _encoding_cache[key] = encoding
+    while len(_encoding_cache) > ENCODING_CACHE_SIZE:
+        _encoding_cache.popitem(last=False)
+    return encoding
+
+
+# Function to get the byte patterns for an encoding, or None if it cannot be scanned as bytes.
+# UTF-8 and single-byte encodings that keep ASCII as is can: '[', '\n', digits etc. are then single
+# bytes that never occur inside another character, so byte matches fall on character boundaries.
+def _byte_patterns(encoding):
+    name = codecs.lookup(encoding).name
+    if name in _byte_pattern_cache:
+        return _byte_pattern_cache[name]
+
+    ascii_bytes = bytes(range(128))
+    if name in ("utf-8", "utf-8-sig", "ascii"):
+        scannable = True
+    else:
+        try:
+            scannable = (ascii_bytes.decode("ascii").encode(name) == ascii_bytes
+                         and len(bytes(range(128, 256)).decode(name, "replace")) == 128)
+        except (UnicodeError, LookupError):
+            scannable = False
+
+    patterns = None
+    if scannable:
+        codec = "utf-8" if name == "utf-8-sig" else name
+        breaks = set()
+        for char in LINE_BREAKS:
+            try:
+                breaks.add(char.encode(codec))
+            except UnicodeEncodeError:
+                pass
+        breaks = sorted(breaks, key=len, reverse=True)
+
+        # The '[' comes first so the regex engine can jump between '[' bytes; the lookbehinds then check it
+        # starts a line. Group 1 runs on to the line end, or to the first byte that may start a multi-byte break.
+        line_start = b'|'.join([rb'(?<=\A\[)'] + [b'(?<=' + re.escape(sequence) + rb'\[)' for sequence in breaks])
+        stop_bytes = b''.join(re.escape(bytes([byte])) for byte in sorted({sequence[0] for sequence in breaks}))
+        patterns = {
+            "header": re.compile(rb'\[(?:' + line_start + b')' + timestamp_bytes_pattern + b'([^' + stop_bytes + b']*)'),
+            "line_break": re.compile(b'|'.join(re.escape(sequence) for sequence in breaks)),
+            "break_leads": frozenset(sequence[0] for sequence in breaks if len(sequence) > 1),
+            "non_ascii": re.compile(rb'[\x80-\xff]')
+        }
+
+    _byte_pattern_cache[name] = patterns
+    return patterns
+
+
+# Function to compile the ticket/ID patterns into one byte pattern, or None if they have no byte version
+def _ticket_prefilter(ticket_order_pattern, id_pattern):
+    try:
+        return re.compile(f'(?:{ticket_order_pattern})|(?:{id_pattern})'.encode("ascii"))
+    except (TypeError, UnicodeEncodeError, re.error):
+        return None
+
+
+# Function to expose an uploaded file from byte offset start (past a UTF-8 BOM at the very beginning) as
+# a read-only memoryview without copying it: the upload's own bytes for in-memory files, a memory map for
+# files on disk, a plain read for anything else. A memory map is unmapped once the last view of it is gone.
+def _file_view(file_data, encoding, start=0):
+    if isinstance(file_data, io.BytesIO):
+        # getvalue() hands out the bytes an upload was created from as they are; getbuffer() would copy them
+        buffer = memoryview(file_data.getvalue())
+    else:
+        try:
+            fileno = file_data.fileno()
+            mappable = os.fstat(fileno).st_size > 0
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            mappable = False
+
+        if mappable:
+            buffer = memoryview(mmap.mmap(fileno, 0, access=mmap.ACCESS_READ))
+        else:
+            file_data.seek(0)
+            buffer = memoryview(file_data.read())
+
+    if start == 0 and codecs.lookup(encoding).name == "utf-8-sig" and buffer[:3] == codecs.BOM_UTF8:
+        start = 3
+    return buffer[start:]
+
+
+# Function to read an uploaded file incrementally from byte offset start; '\n'.join() of the yielded
+# lines equals the decoded file (from start)
+def iter_file_lines(file_data, encoding="utf-8", start=0):
+    file_data.seek(start)
+    decoder = codecs.getincrementaldecoder(encoding)("replace")
+    pending = ''
+    for block in iter(lambda: file_data.read(1 << 16), b''):
+        lines = (pending + decoder.decode(block)).split('\n')
+        pending = lines.pop()
+        yield from lines
+
+    # An empty file or a final newline leaves one empty trailing line, like str.split('\n')
+    yield from (pending + decoder.decode(b'', final=True)).split('\n')
+
+
+# Function to turn '\n'-separated lines into the same lines str.splitlines() gives for the whole text
+def iter_splitlines(lines):
+    previous = None
+    for line in lines:
+        if previous is not None:
+            yield from (previous + '\n').splitlines()
+        previous = line
+
+    # The trailing empty line only marks a final newline
+    if previous:
+        yield from previous.splitlines()
+
+
+# Function to build a regex alternation from a character trie so shared name prefixes are matched once
+def _trie_regex(trie):
+    branches = [re.escape(char) + _trie_regex(child) for char, child in sorted(trie.items()) if char]
+    if '' in trie:
+        branches.append('')
+
+    if len(branches) == 1:
+        return branches[0]
+    return '(?:' + '|'.join(branches) + ')'
+
+
+# Matcher for excluded senders; checks every base name in one pass over the header's sender part
+class SenderMatcher:
+    def __init__(self, base_names):
+        self.base_names = tuple(base_names)
+        self.longest = max(map(len, self.base_names), default=0)
+
+        # The regex is compiled on first use, so building a matcher stays cheap
+        self.compiled = False
+        self.pattern = None
+
+    def _compile(self):
+        trie = {}
+        for name in self.base_names:
+            node = trie
+            for char in name:
+                node = node.setdefault(char, {})
+            node[''] = {}
+
+        self.pattern = re.compile(rf'\b{_trie_regex(trie)}\b', re.IGNORECASE) if trie else None
+        self.compiled = True
+
+    # Function to compile the regex now rather than on first use; returns the matcher
+    def compile(self):
+        if not self.compiled:
+            self._compile()
+        return self
+
+    def matches(self, line, sender_start=0):
+        if not self.compiled:
+            self._compile()
+        if self.pattern is None:
+            return False
+
+        # The sender part runs up to and including the first ': ' after the timestamp
+        sender_end = line.find(': ', sender_start)
+        sender_end = len(line) if sender_end == -1 else sender_end + 2
+
+        match = self.pattern.search(line, 0, sender_end + self.longest + 1)
+        return match is not None and match.start() < sender_end
+
+
+# Function to yield cleaned message blocks, dropping blocks whose header line names an excluded sender
+def iter_filtered_blocks(lines, sender_matcher):
+    skip_block = False
+    current_message = []
+
+    for line in lines:
+        timestamp = timestamp_pattern.match(line)
+        if timestamp:
+            if current_message:
+                yield ' '.join(current_message).strip().lower()
+                current_message = []
+
+            skip_block = sender_matcher.matches(line, timestamp.end())
+
+        if not skip_block:
+            current_message.append(line.strip().lower())
+
+    if not skip_block and current_message:
+        yield ' '.join(current_message).strip().lower()
+
+
+# Function to clean one message block the way iter_filtered_blocks does
+def _clean_block(text):
+    return ' '.join([line.strip().lower() for line in text.splitlines()]).strip().lower()
+
+
+# Function to yield the cleaned blocks of a raw export by scanning its bytes for headers.
+# Only the header line of each block is decoded for the sender check; the rest of a block is
+# decoded only if the block is kept. Yields the same blocks as iter_filtered_blocks on the decoded text.
+def _iter_buffer_blocks(file_data, encoding, sender_matcher, start=0):
+    patterns = _byte_patterns(encoding)
+    view = _file_view(file_data, encoding, start)
+    block_start = 0
+    skip_block = False
+
+    for header in patterns["header"].finditer(view):
+        header_start = header.start()
+        if not skip_block and header_start > block_start:
+            yield _clean_block(str(view[block_start:header_start], encoding, "replace"))
+
+        line_end = header.end()
+        if line_end < len(view) and view[line_end] in patterns["break_leads"]:
+            line_break = patterns["line_break"].search(view, line_end)
+            line_end = line_break.start() if line_break else len(view)
+        header_line = str(view[header_start:line_end], encoding, "replace")
+        skip_block = sender_matcher.matches(header_line, header.start(1) - header_start)
+        block_start = header_start
+
+    if not skip_block and len(view) > block_start:
+        yield _clean_block(str(view[block_start:], encoding, "replace"))
+
+
+# Function to stream the cleaned blocks of an uploaded raw export in its detected encoding
+def iter_file_blocks(file_data, sender_matcher, start=0):
+    encoding = detect_encoding(file_data)
+    if _byte_patterns(encoding) is not None:
+        return _iter_buffer_blocks(file_data, encoding, sender_matcher, start)
+
+    return iter_filtered_blocks(iter_splitlines(iter_file_lines(file_data, encoding, start)), sender_matcher)
+
+
+# Function to turn the comma-separated base names input into a list of names
+def parse_base_names(base_names_input):
+    return [name.strip() for name in base_names_input.split(",")]
+
+
+# Function to process the uploaded files for text file processing with regex filtering
+def filter_messages(input_files, base_names):
+    # Accept either a list of base names or a prebuilt matcher
+    sender_matcher = base_names if isinstance(base_names, SenderMatcher) else SenderMatcher(base_names)
+
+    results = {}
+
+    for file_name, file_data in input_files.items():
+        results[file_name] = '\n\n'.join(iter_file_blocks(file_data, sender_matcher))
+
+    return results
+
+
+# Function to write the cleaned text of a raw export to an open text file block by block,
+# exactly as filter_messages joins it but without holding it in memory
+def write_cleaned_text(file_data, sender_matcher, out):
+    for index, block in enumerate(iter_file_blocks(file_data, sender_matcher)):
+        out.write(f"\n\n{block}" if index else block)
+
+
+# Function to split newline-free pieces joined by `separator` into messages, exactly like
+# message_split_pattern.split() on the joined text but without ever building that text.
+# With with_headers, yields (header, message) pairs, header being the 24-hour header the message was split at or ''.
+def iter_messages(pieces, separator='\n', with_headers=False):
+    pending = []
+    header = ''
+    first = True
+
+    for piece in pieces:
+        parts = message_split_capture_pattern.split(piece if first else separator + piece)
+        first = False
+
+        pending.append(parts[0])
+        for index in range(1, len(parts), 2):
+            message = ''.join(pending)
+            yield (header, message) if with_headers else message
+            # 12-hour boundaries are the newline before the header, which stays in the message
+            header = parts[index] if parts[index] != '\n' else ''
+            pending = [parts[index + 1]]
+
+    message = ''.join(pending)
+    yield (header, message) if with_headers else message
+
+
+# Function to find literal strings of which at least one must appear in any match of a parsed regex
+def _required_literals(items):
+    best = None
+    run = []
+
+    def consider(candidates):
+        nonlocal best
+        if not candidates:
+            return
+        if best is None or (min(map(len, candidates)), -len(candidates)) > (min(map(len, best)), -len(best)):
+            best = candidates
+
+    for op, av in items:
+        if op is sre_parse.LITERAL and av < 128:
+            run.append(chr(av).lower())
+            continue
+        if run:
+            consider({''.join(run)})
+            run = []
+
+        if op is sre_parse.SUBPATTERN:
+            consider(_required_literals(av[-1]))
+        elif op is sre_parse.ASSERT:
+            consider(_required_literals(av[1]))
+        elif op is sre_parse.BRANCH:
+            branches = [_required_literals(branch) for branch in av[1]]
+            if all(branches):
+                consider(set().union(*branches))
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+            consider(_required_literals(av[2]))
+
+    if run:
+        consider({''.join(run)})
+
+    return best
+
+
+# Per-issue pattern statistics (calls, hits, cumulative and max match time) with an optional per-message
+# time budget. Python's re cannot interrupt a running search, so the budget works between searches:
+# once a message has used it up, its remaining patterns are skipped for that message only. A pattern whose
+# own searches go over the budget quarantine_after times, or a single one by more than quarantine_factor times,
+# is quarantined: skipped for every later message of the run, so a runaway pattern costs a few searches, not one per message.
+# A one-off pause (e.g. garbage collection) only counts as one overrun. Messages that had patterns skipped
+# are counted and sampled with the issues skipped for them.
+class PatternProfiler:
+    def __init__(self, issues, message_budget=None, max_examples=20, quarantine_after=3, quarantine_factor=10):
+        self.message_budget = message_budget
+        self.max_examples = max_examples
+        self.quarantine_after = quarantine_after
+        self.quarantine_factor = quarantine_factor
+        self.stats = {issue: self._empty_stats() for issue in issues}
+        self.flagged_messages = 0
+        self.flagged_examples = []
+
+        # Run-wide state, kept by take(): overruns per issue and the issues quarantined so far
+        self.overruns = dict.fromkeys(self.stats, 0)
+        self.quarantined = set()
+
+    @staticmethod
+    def _empty_stats():
+        return {"calls": 0, "hits": 0, "total_time": 0.0, "max_time": 0.0, "over_budget": 0, "skipped": 0}
+
+    def flag_message(self, message, skipped_issues):
+        self.flagged_messages += 1
+        if len(self.flagged_examples) < self.max_examples:
+            self.flagged_examples.append({"message": message[:200], "skipped_issues": list(skipped_issues)})
+
+    # Function to record a search of issue that went over the budget, quarantining the issue when due
+    def record_overrun(self, issue, elapsed):
+        self.stats[issue]["over_budget"] += 1
+        self.overruns[issue] += 1
+        if self.overruns[issue] >= self.quarantine_after or elapsed > self.quarantine_factor * self.message_budget:
+            self.quarantined.add(issue)
+
+    # Function to hand over the statistics gathered so far and start counting afresh
+    def take(self):
+        taken = self.to_dict()
+        self.stats = {issue: self._empty_stats() for issue in self.stats}
+        self.flagged_messages = 0
+        self.flagged_examples = []
+        return taken
+
+    # Function to add statistics from another profiler's to_dict()/take(); its quarantined issues are
+    # quarantined here too (each pool worker quarantines on its own overruns)
+    def merge(self, other):
+        for issue, other_stats in other["stats"].items():
+            stats = self.stats[issue]
+            for key in ("calls", "hits", "total_time", "over_budget", "skipped"):
+                stats[key] += other_stats[key]
+            stats["max_time"] = max(stats["max_time"], other_stats["max_time"])
+
+        self.flagged_messages += other["flagged_messages"]
+        self.flagged_examples.extend(other["flagged_examples"][:self.max_examples - len(self.flagged_examples)])
+        self.quarantined.update(other["quarantined"])
+
+    # Function to get one table row per issue, slowest cumulative time first
+    def rows(self):
+        rows = [
+            {
+                "Issue": issue,
+                "Calls": stats["calls"],
+                "Hits": stats["hits"],
+                "Total (ms)": round(stats["total_time"] * 1000, 3),
+                "Max (ms)": round(stats["max_time"] * 1000, 3),
+                "Mean (µs)": round(stats["total_time"] / stats["calls"] * 1e6, 1) if stats["calls"] else 0.0,
+                "Over budget": stats["over_budget"],
+                "Skipped": stats["skipped"],
+                "Quarantined": issue in self.quarantined
+            }
+            for issue, stats in self.stats.items()
+        ]
+        return sorted(rows, key=lambda row: row["Total (ms)"], reverse=True)
+
+    def to_dict(self):
+        return {
+            "message_budget": self.message_budget,
+            "stats": copy.deepcopy(self.stats),
+            "flagged_messages": self.flagged_messages,
+            "flagged_examples": list(self.flagged_examples),
+            "quarantined": sorted(self.quarantined)
+        }
+
+    # Function to write the statistics as JSON
+    def dump(self, path):
+        with open(path, "w", encoding="utf-8") as dump_file:
+            json.dump(self.to_dict(), dump_file, indent=2)
+
+
+# Classifier built once from issue_patterns; returns the first matching issue (dict order wins)
+class IssueClassifier:
+    def __init__(self, issue_patterns):
+        self.issue_patterns = dict(issue_patterns)
+        self.issues = list(issue_patterns)
+        self.profiler = None
+
+        # Patterns and the prefilter are compiled on first use, so building a classifier stays cheap
+        self.patterns = None
+
+    def _compile(self):
+        # Cheap prefilter: a pattern can only match if one of its required literals is in the message.
+        # Each distinct literal is checked once per message and unlocks a bitmask of patterns.
+        self.always_mask = 0
+        self.literal_masks = {}
+        for index, pattern in enumerate(self.issue_patterns.values()):
+            literals = _required_literals(sre_parse.parse(pattern, re.IGNORECASE))
+            if not literals:
+                self.always_mask |= 1 << index
+                continue
+            # A literal containing another one of the same pattern adds nothing
+            for literal in literals:
+                if not any(other != literal and other in literal for other in literals):
+                    self.literal_masks[literal] = self.literal_masks.get(literal, 0) | (1 << index)
+
+        self.patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.issue_patterns.values()]
+
+    def _candidates(self, message):
+        # Case-insensitive matching equals lowercase substring matching only for ASCII text
+        if not message.isascii():
+            return list(range(len(self.patterns)))
+
+        text = message.lower()
+        mask = self.always_mask
+        for literal, literal_mask in self.literal_masks.items():
+            if literal in text:
+                mask |= literal_mask
+
+        return [index for index in range(len(self.patterns)) if mask >> index & 1]
+
+    # Function to compile the patterns and prefilter now rather than on first use; returns the classifier
+    def compile(self):
+        if self.patterns is None:
+            self._compile()
+        return self
+
+    # Function to get a copy of this classifier that records per-pattern statistics in profiler
+    def with_profiler(self, profiler):
+        if self.patterns is None:
+            self._compile()
+        profiled = copy.copy(self)
+        profiled.profiler = profiler
+        return profiled
+
+    def classify(self, message):
+        if self.patterns is None:
+            self._compile()
+        if self.profiler is not None:
+            return self._classify_profiled(message)
+
+        for index in self._candidates(message):
+            if self.patterns[index].search(message):
+                return self.issues[index]
+
+        return None
+
+    def _classify_profiled(self, message):
+        profiler = self.profiler
+        budget = profiler.message_budget
+        spent = 0.0
+        skipped = []
+
+        for index in self._candidates(message):
+            issue = self.issues[index]
+            stats = profiler.stats[issue]
+
+            # The pattern is quarantined, or this message has used up its budget (the remaining patterns are skipped for it alone)
+            if issue in profiler.quarantined or (budget is not None and spent >= budget):
+                stats["skipped"] += 1
+                skipped.append(issue)
+                continue
+
+            start = time.perf_counter()
+            match = self.patterns[index].search(message)
+            elapsed = time.perf_counter() - start
+
+            spent += elapsed
+            stats["calls"] += 1
+            stats["total_time"] += elapsed
+            stats["max_time"] = max(stats["max_time"], elapsed)
+            if budget is not None and elapsed > budget:
+                profiler.record_overrun(issue, elapsed)
+
+            if match:
+                stats["hits"] += 1
+                if skipped:
+                    profiler.flag_message(message, skipped)
+                return issue
+
+        if skipped:
+            profiler.flag_message(message, skipped)
+        return None
+
+
+# Function to get the time of a message as "YYYY-MM-DD HH:MM" from the header it was split at
+# or the one it starts with; None when it has neither
+def message_timestamp(header, message):
+    match = header_time_pattern.match(header)
+    if match:
+        hour, minute, day, month, year = match.groups()
+    else:
+        match = message_time_pattern.match(message)
+        if match is None:
+            return None
+        day, month, year, hour, minute, meridiem = match.groups()
+        hour = int(hour) % 12 + (12 if meridiem.lower() == 'pm' else 0)
+
+    return f"{int(year):04d}-{int(month):02d}-{int(day):02d} {int(hour):02d}:{int(minute or 0):02d}"
+
+
+# Function to classify messages, yielding (issue, tickets, ids, message) in order for those carrying tickets/IDs.
+# With first_position, messages are (header, message) pairs (see iter_messages) and each record also
+# carries the message's position in the stream, counted from first_position, and its timestamp.
+def iter_message_records(messages, issue_patterns, ticket_order_pattern, id_pattern, first_position=None):
+    # Accept either a raw pattern dict or a prebuilt classifier
+    classifier = issue_patterns if isinstance(issue_patterns, IssueClassifier) else IssueClassifier(issue_patterns)
+    ticket_order_regex = re.compile(ticket_order_pattern)
+    id_regex = re.compile(id_pattern)
+
+    if first_position is not None:
+        for position, (header, message) in enumerate(messages, first_position):
+            tickets = ticket_order_regex.findall(message)
+            ids = id_regex.findall(message)
+            if tickets or ids:
+                yield classifier.classify(message), tickets, ids, message, position, message_timestamp(header, message)
+        return
+
+    for message in messages:
+        tickets = ticket_order_regex.findall(message)
+        ids = id_regex.findall(message)
+
+        # Messages without tickets/IDs never reach the report, so they are not classified
+        if tickets or ids:
+            yield classifier.classify(message), tickets, ids, message
+
+
+# Function to collect the tickets/IDs for each issue, keeping the first occurrence of each
+# Pass added_tickets/added_ids to skip numbers seen earlier; the sets are updated in place
+def merge_message_records(records, added_tickets=None, added_ids=None):
+    result = CompactResult()
+
+    added_tickets = set() if added_tickets is None else added_tickets
+    added_ids = set() if added_ids is None else added_ids
+
+    # Process each message block (records with positions carry two more fields, not needed here)
+    for issue, tickets, ids, message, *_ in records:
+        # Check for issues and collect tickets/IDs
+        if issue is not None:
+            if issue == "Full Capping":
+                if ids:
+                    result.add(issue, [i for i in ids if i not in added_ids])
+                    added_ids.update(ids)
+            else:
+                if tickets:
+                    result.add(issue, [t for t in tickets if t not in added_tickets])
+                    added_tickets.update(tickets)
+                if ids:
+                    result.add(issue, [i for i in ids if i not in added_ids])
+                    added_ids.update(ids)
+
+        else:
+            if tickets:
+                result.add_other([t for t in tickets if t not in added_tickets], message)
+                added_tickets.update(tickets)
+            if ids:
+                result.add_other([i for i in ids if i not in added_ids], message)
+                added_ids.update(ids)
+
+    return result
+
+
+# Function to classify a stream of messages and collect the tickets/IDs for each issue
+def classify_messages(messages, issue_patterns, ticket_order_pattern, id_pattern):
+    return merge_message_records(iter_message_records(messages, issue_patterns, ticket_order_pattern, id_pattern))
+
+
+# Function to process the text file input
+def process_messages_from_content(file_content, issue_patterns, ticket_order_pattern, id_pattern):
+    # Split content into individual messages based on the pattern of new blocks
+    messages = message_split_pattern.split(file_content)
+    return classify_messages(messages, issue_patterns, ticket_order_pattern, id_pattern)
+
+
+# Function to yield the messages of an already filtered file by splitting its bytes, like
+# message_split_pattern.split() on the decoded text. With a prefilter (see _ticket_prefilter), ASCII
+# messages it does not match cannot carry tickets/IDs and are yielded as '' without being decoded,
+# so message positions stay the same. with_headers works as in iter_messages.
+def _iter_buffer_messages(file_data, encoding, start=0, prefilter=None, with_headers=False):
+    non_ascii = _byte_patterns(encoding)["non_ascii"]
+    view = _file_view(file_data, encoding, start)
+    message_start = 0
+    header = ''
+    boundaries = ((boundary.start(), boundary.end()) for boundary in message_split_bytes_pattern.finditer(view))
+
+    for message_end, next_start in itertools.chain(boundaries, [(len(view), len(view))]):
+        message = view[message_start:message_end]
+        if prefilter is None or non_ascii.search(message) or prefilter.search(message):
+            message = str(message, encoding, "replace")
+        else:
+            message = ''
+        yield (header, message) if with_headers else message
+
+        if with_headers and next_start - message_end > 1:
+            header = str(view[message_end:next_start], "ascii")
+        else:
+            header = ''
+        message_start = next_start
+
+
+# Function to stream the messages of an upload; raw exports are sender-filtered first,
+# already filtered files (sender_matcher=None) are split as they are. A prefilter only
+# lets through the messages of filtered files that can carry tickets/IDs (the others come out as '').
+# With with_headers, yields (header, message) pairs as iter_messages does.
+def iter_file_messages(file_data, sender_matcher=None, start=0, prefilter=None, with_headers=False):
+    if sender_matcher is not None:
+        return iter_messages(iter_file_blocks(file_data, sender_matcher, start), '\n\n', with_headers)
+
+    encoding = detect_encoding(file_data)
+    if _byte_patterns(encoding) is not None:
+        return _iter_buffer_messages(file_data, encoding, start, prefilter, with_headers)
+
+    return iter_messages(iter_file_lines(file_data, encoding, start), with_headers=with_headers)
+
+
+# Function to filter and classify an uploaded raw export in one streaming pass
+def process_uploaded_file(file_data, base_names, issue_patterns, ticket_order_pattern, id_pattern):
+    sender_matcher = base_names if isinstance(base_names, SenderMatcher) else SenderMatcher(base_names)
+    return classify_messages(iter_file_messages(file_data, sender_matcher), issue_patterns, ticket_order_pattern, id_pattern)
+
+
+# Inputs smaller than this (in bytes) are processed serially; a process pool would cost more than it saves
+PARALLEL_MIN_BYTES = 1_000_000
+
+# Approximate number of characters of whole messages sent to a worker per task
+PARALLEL_CHUNK_CHARS = 256_000
+
+# Per-process state for pool workers, set once by _init_worker
+_worker_state = {}
+
+
+def _init_worker(issue_patterns, ticket_order_pattern, id_pattern):
+    _worker_state['args'] = (issue_patterns, ticket_order_pattern, id_pattern)
+
+
+def _classify_chunk(messages, first_position=None):
+    records = iter_message_records(messages, *_worker_state['args'], first_position)
+    # Only "Other" entries need the message text back in the parent
+    records = [(issue, tickets, ids, message if issue is None else None, *rest) for issue, tickets, ids, message, *rest in records]
+
+    # Send this chunk's pattern statistics back too, so the parent profiler sees every worker
+    profiler = _worker_state['args'][0].profiler
+    return records, profiler.take() if profiler is not None else None
+
+
+def _collect_chunk(classifier, file_records, chunk_result):
+    chunk_records, chunk_stats = chunk_result
+    file_records.extend(chunk_records)
+    if chunk_stats is not None:
+        classifier.profiler.merge(chunk_stats)
+
+
+# Function to group a message stream (of messages or (header, message) pairs) into message-aligned
+# chunks of about chunk_chars characters
+def iter_message_chunks(messages, chunk_chars=PARALLEL_CHUNK_CHARS):
+    chunk = []
+    size = 0
+    for message in messages:
+        chunk.append(message)
+        size += len(message) if isinstance(message, str) else len(message[1])
+        if size >= chunk_chars:
+            yield chunk
+            chunk = []
+            size = 0
+
+    if chunk:
+        yield chunk
+
+
+# Function to get the size of an uploaded file in bytes without reading it
+def _file_size(file_data):
+    position = file_data.tell()
+    size = file_data.seek(0, 2)
+    file_data.seek(position)
+    return size
+
+
+# Function to group the messages of several sources into chunks, yielding (file name, position of the first message, chunk)
+def _iter_source_chunks(sources, prefilter, with_headers):
+    for file_name, (file_data, sender_matcher) in sources.items():
+        position = 0
+        messages = iter_file_messages(file_data, sender_matcher, prefilter=prefilter, with_headers=with_headers)
+        for chunk in iter_message_chunks(messages, PARALLEL_CHUNK_CHARS):
+            yield file_name, position, chunk
+            position += len(chunk)
+
+
+# Function to classify message chunks across worker processes when it pays off.
+# Chunk results are merged per file in their original order, so the report matches the serial one exactly.
+# With an index (see TicketIndex), every ticket/ID occurrence is also added to it.
+def _process_sources(sources, classifier, ticket_order_pattern, id_pattern, workers, index=None):
+    total_size = sum(_file_size(file_data) for file_data, _ in sources.values())
+    prefilter = _ticket_prefilter(ticket_order_pattern, id_pattern)
+    first_position = None if index is None else 0
+
+    if workers <= 1 or total_size < PARALLEL_MIN_BYTES:
+        results = {}
+        for file_name, (file_data, sender_matcher) in sources.items():
+            messages = iter_file_messages(file_data, sender_matcher, prefilter=prefilter, with_headers=index is not None)
+            records = iter_message_records(messages, classifier, ticket_order_pattern, id_pattern, first_position)
+            results[file_name] = merge_message_records(records if index is None else index.add_records(file_name, records))
+        return results
+
+    # Chunks of all files go through one ordered window of in-flight tasks, so small files run side by side
+    # while at most a few chunks per worker are held in memory
+    chunks = _iter_source_chunks(sources, prefilter, index is not None)
+    records = {file_name: [] for file_name in sources}
+    pending = deque()
+
+    # Imported here so the serial path (and CLI startup) never pays for them
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Plain fork() from a multi-threaded process (the Streamlit server) can deadlock the children, so workers
+    # come from a forkserver, which has this UI-free module preloaded; elsewhere the platform default is used
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload([__name__])
+    else:
+        context = multiprocessing.get_context()
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(classifier, ticket_order_pattern, id_pattern)
+    ) as executor:
+        for file_name, position, chunk in chunks:
+            pending.append((file_name, executor.submit(_classify_chunk, chunk, None if index is None else position)))
+            if len(pending) >= 2 * workers:
+                done_name, future = pending.popleft()
+                _collect_chunk(classifier, records[done_name], future.result())
+
+        while pending:
+            done_name, future = pending.popleft()
+            _collect_chunk(classifier, records[done_name], future.result())
+
+    return {
+        file_name: merge_message_records(file_records if index is None else index.add_records(file_name, file_records))
+        for file_name, file_records in records.items()
+    }
+
+
+# Bump when a change to the processing code alters results, so stale cache entries are ignored
+RESULT_CACHE_VERSION = 3
+
+
+# Function to build the cache key of one upload: a hash of its bytes plus everything that shapes its result
+def result_cache_key(file_data, sender_matcher, classifier, ticket_order_pattern, id_pattern):
+    digest = hashlib.sha256()
+
+    file_data.seek(0)
+    for block in iter(lambda: file_data.read(1 << 20), b''):
+        digest.update(block)
+    file_data.seek(0)
+
+    settings = [
+        RESULT_CACHE_VERSION,
+        None if sender_matcher is None else list(sender_matcher.base_names),
+        list(classifier.issue_patterns.items()),
+        ticket_order_pattern,
+        id_pattern
+    ]
+    digest.update(json.dumps(settings).encode("utf-8"))
+    return digest.hexdigest()
+
+
+# Cache of per-file results: an in-memory LRU tier and an optional on-disk tier (one JSON file per key).
+# The disk tier keeps at most max_disk_entries files, dropping the least recently used ones (by modification time).
+class ResultCache:
+    def __init__(self, max_entries=64, cache_dir=None, max_disk_entries=1024):
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.cache_dir = cache_dir
+        self.entries = OrderedDict()
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+        if not self.cache_dir:
+            return None
+
+        try:
+            with open(self._path(key), encoding="utf-8") as cache_file:
+                result = json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+
+        # Mark the entry as recently used for the disk tier's eviction
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+
+        result = CompactResult.from_dict(result)
+        self._remember(key, result)
+        return result
+
+    def put(self, key, result):
+        self._remember(key, result)
+
+        if self.cache_dir:
+            # Write to a temporary file first so a crash never leaves a truncated entry behind.
+            # The disk tier is best-effort: if it cannot be written (full disk, read-only folder),
+            # the result stays in the memory tier and the run carries on
+            temp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+            try:
+                with open(temp_path, "w", encoding="utf-8") as cache_file:
+                    json.dump(result.to_dict(), cache_file)
+                os.replace(temp_path, self._path(key))
+                self._prune_disk()
+            except OSError:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+    # Function to delete the least recently used disk entries beyond max_disk_entries
+    def _prune_disk(self):
+        entries = []
+        with os.scandir(self.cache_dir) as scan:
+            for entry in scan:
+                if entry.name.endswith(".json"):
+                    try:
+                        entries.append((entry.stat().st_mtime, entry.path))
+                    except OSError:
+                        pass
+
+        entries.sort()
+        for _, path in entries[:max(0, len(entries) - self.max_disk_entries)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _remember(self, key, result):
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+# Bytes before a checkpoint offset that must be unchanged for the offset to be reused
+CHECKPOINT_VERIFY_BYTES = 4096
+
+
+# Function to tell whether a line can be a resume point: it starts a message both for the sender
+# filter and for message_split_pattern (24-hour header) and its sender is not excluded
+def _is_resume_line(line, sender_matcher):
+    header = message_start_pattern.match(line)
+    return header is not None and (sender_matcher is None or not sender_matcher.matches(line, header.end()))
+
+
+# Function to find the byte offset of the last resume line at or after start, reading backwards
+# from the end so only the last message is scanned. Encodings that cannot be scanned as bytes have no resume point.
+def find_resume_offset(file_data, sender_matcher=None, start=0, encoding="utf-8"):
+    if _byte_patterns(encoding) is None:
+        return None
+
+    position = file_data.seek(0, 2)
+    tail = b''
+
+    while position > start:
+        size = min(1 << 16, position - start)
+        position -= size
+        file_data.seek(position)
+        tail = file_data.read(size) + tail
+
+        # Candidates are '[' right after a newline; check the new bytes (and the join with the old ones) only
+        search_end = size + 1
+        while True:
+            index = tail.rfind(b'\n[', 0, search_end)
+            if index == -1:
+                break
+            line_end = tail.find(b'\n', index + 1)
+            line = tail[index + 1:line_end if line_end != -1 else len(tail)]
+            if _is_resume_line(line.decode(encoding, "replace"), sender_matcher):
+                return position + index + 1
+            search_end = index + 1
+
+        if position == start and tail.startswith(b'['):
+            line_end = tail.find(b'\n')
+            if _is_resume_line(tail[:line_end if line_end != -1 else len(tail)].decode(encoding, "replace"), sender_matcher):
+                return position
+
+    return None
+
+
+# Function to hash the bytes just before a checkpoint offset, used to check a new export extends the old one
+def _checkpoint_digest(file_data, offset):
+    file_data.seek(max(0, offset - CHECKPOINT_VERIFY_BYTES))
+    return hashlib.sha256(file_data.read(min(offset, CHECKPOINT_VERIFY_BYTES))).hexdigest()
+
+
+def _checkpoint_path(checkpoint_dir, chat_id):
+    return os.path.join(checkpoint_dir, hashlib.sha1(chat_id.encode("utf-8")).hexdigest() + ".json")
+
+
+# Function to load the checkpoint of a chat; returns None when there is none yet
+def load_checkpoint(checkpoint_dir, chat_id):
+    try:
+        with open(_checkpoint_path(checkpoint_dir, chat_id), encoding="utf-8") as checkpoint_file:
+            return json.load(checkpoint_file)
+    except (OSError, ValueError):
+        return None
+
+
+# Function to save the checkpoint of a chat, replacing the previous one atomically
+def save_checkpoint(checkpoint_dir, chat_id, checkpoint):
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    path = _checkpoint_path(checkpoint_dir, chat_id)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as checkpoint_file:
+        json.dump(checkpoint, checkpoint_file)
+    os.replace(temp_path, path)
+
+
+# Function to process only what was appended to a cumulative chat export since the last run.
+# Reading resumes at the last 24-hour message header of the previous run (that message may have grown),
+# and the tickets/IDs seen in earlier runs are skipped, so the result only holds new ones. If the export no longer
+# extends the checkpointed one, the whole file is read but earlier tickets/IDs are still skipped.
+# The checkpoint also keeps the position of the message at the offset, so indexed positions count from the file start.
+def process_incremental(file_data, chat_id, sender_matcher, issue_patterns, ticket_order_pattern, id_pattern, checkpoint_dir, index=None):
+    checkpoint = load_checkpoint(checkpoint_dir, chat_id) or {"offset": 0, "digest": None, "tickets": [], "ids": []}
+    added_tickets = set(checkpoint["tickets"])
+    added_ids = set(checkpoint["ids"])
+    prefilter = _ticket_prefilter(ticket_order_pattern, id_pattern)
+
+    start = checkpoint["offset"]
+    position = checkpoint.get("position", 0)
+    if start > _file_size(file_data) or _checkpoint_digest(file_data, start) != checkpoint["digest"]:
+        start = 0
+        position = 0
+
+    # zip() advances the counter once per message, so it ends up holding the number of messages read
+    counter = itertools.count()
+    messages = iter_file_messages(file_data, sender_matcher, start, prefilter, with_headers=index is not None)
+    messages = (message for message, _ in zip(messages, counter))
+    records = iter_message_records(messages, issue_patterns, ticket_order_pattern, id_pattern, None if index is None else position)
+    result = merge_message_records(records if index is None else index.add_records(chat_id, records), added_tickets, added_ids)
+    message_count = next(counter)
+
+    offset = find_resume_offset(file_data, sender_matcher, start, detect_encoding(file_data))
+    if offset is not None and offset != start:
+        # Read from the offset, the stream starts with an empty message before the header there, standing in
+        # for everything before it; so the next run's first position is this run's messages minus those read again
+        position += message_count - sum(1 for _ in iter_file_messages(file_data, sender_matcher, offset, prefilter))
+    offset = start if offset is None else offset
+    save_checkpoint(checkpoint_dir, chat_id, {
+        "chat": chat_id,
+        "offset": offset,
+        "position": position,
+        "digest": _checkpoint_digest(file_data, offset),
+        "tickets": sorted(added_tickets),
+        "ids": sorted(added_ids)
+    })
+
+    return result
+
+
+# Function to process several uploads, reusing cached results for unchanged files and settings.
+# sources maps file name -> (file_data, sender_matcher or None for already filtered files).
+# With a checkpoint_dir, each file is processed incrementally and only new tickets/IDs are reported.
+# With an index (see TicketIndex), the ticket/ID occurrences of every file read are added to it;
+# cached results are only reused for files the index already holds.
+def process_uploaded_files(sources, issue_patterns, ticket_order_pattern, id_pattern, workers=None, cache=None, checkpoint_dir=None, index=None):
+    classifier = issue_patterns if isinstance(issue_patterns, IssueClassifier) else IssueClassifier(issue_patterns)
+    workers = workers or os.cpu_count() or 1
+
+    if checkpoint_dir:
+        return {
+            file_name: process_incremental(file_data, file_name, sender_matcher, classifier, ticket_order_pattern, id_pattern, checkpoint_dir, index)
+            for file_name, (file_data, sender_matcher) in sources.items()
+        }
+
+    if cache is None:
+        return _process_sources(sources, classifier, ticket_order_pattern, id_pattern, workers, index)
+
+    keys = {
+        file_name: result_cache_key(file_data, sender_matcher, classifier, ticket_order_pattern, id_pattern)
+        for file_name, (file_data, sender_matcher) in sources.items()
+    }
+    results = {file_name: cache.get(key) for file_name, key in keys.items()}
+
+    missing = {
+        file_name: source for file_name, source in sources.items()
+        if results[file_name] is None or (index is not None and not index.has_source(file_name, keys[file_name]))
+    }
+    if missing:
+        for file_name, result in _process_sources(missing, classifier, ticket_order_pattern, id_pattern, workers, index).items():
+            cache.put(keys[file_name], result)
+            results[file_name] = result
+            if index is not None:
+                index.add_source(file_name, keys[file_name])
+
+    return results
@@ -0,0 +1,84 @@
+import os
+import sqlite3
+import threading
+
+# Persistent ticket/ID index, appended to as reports are generated and queried without reading any chat text.
+
+# Rows added per transaction while a file is indexed, so other writers never wait long for the database
+INDEX_BATCH_ROWS = 10_000
+
+
+# Inverted index of ticket/ID occurrences in an SQLite file. Each row is one ticket/ID in one message:
+# the file, the message position in that file, the message time and its issue ("Other" when none matched).
+# The table is keyed on the ticket/ID, so a lookup reads only that ticket/ID's rows however long the history.
+# Re-reading a message (cumulative exports, reruns) replaces its rows, so a message that grew since is indexed as it is now.
+class TicketIndex:
+    def __init__(self, path):
+        self.path = path
+        self.local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        connection = self._connection()
+        # Write-ahead logging lets lookups run while a report is being added
+        connection.execute("PRAGMA journal_mode=WAL")
+        with connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS occurrences ("
+                " number TEXT NOT NULL COLLATE NOCASE,"
+                " file TEXT NOT NULL,"
+                " message INTEGER NOT NULL,"
+                " timestamp TEXT,"
+                " issue TEXT NOT NULL,"
+                " PRIMARY KEY (number, file, message)"
+                ") WITHOUT ROWID"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS indexed_files (file TEXT NOT NULL, key TEXT NOT NULL, PRIMARY KEY (file, key)) WITHOUT ROWID"
+            )
+
+    # Function to get this thread's connection; Streamlit runs each session in its own thread
+    def _connection(self):
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = self.local.connection = sqlite3.connect(self.path, timeout=30)
+        return connection
+
+    def _insert(self, rows):
+        with self._connection() as connection:
+            connection.executemany("INSERT OR REPLACE INTO occurrences VALUES (?, ?, ?, ?, ?)", rows)
+
+    # Function to pass records with positions (see iter_message_records) through unchanged,
+    # adding the occurrences of their tickets/IDs to the index on the way
+    def add_records(self, file_name, records):
+        rows = []
+        for record in records:
+            issue, tickets, ids, _, position, timestamp = record
+            issue = "Other" if issue is None else issue
+            rows.extend((number, file_name, position, timestamp, issue) for number in tickets + ids)
+            if len(rows) >= INDEX_BATCH_ROWS:
+                self._insert(rows)
+                rows = []
+            yield record
+
+        self._insert(rows)
+
+    # Function to tell whether this upload (result cache key) was indexed before under this file name;
+    # rows are kept per file name, so the same export under another name still needs its own rows
+    def has_source(self, file_name, key):
+        row = self._connection().execute("SELECT 1 FROM indexed_files WHERE file = ? AND key = ?", (file_name, key)).fetchone()
+        return row is not None
+
+    def add_source(self, file_name, key):
+        with self._connection() as connection:
+            connection.execute("INSERT OR IGNORE INTO indexed_files VALUES (?, ?)", (file_name, key))
+
+    # Function to get every occurrence of a ticket/ID (case-insensitive), oldest first
+    def lookup(self, number):
+        rows = self._connection().execute(
+            "SELECT file, message, timestamp, issue FROM occurrences WHERE number = ? ORDER BY timestamp, file, message",
+            (number.strip(),)
+        )
+        return [{"file": file, "message": message, "timestamp": timestamp, "issue": issue} for file, message, timestamp, issue in rows]
@@ -0,0 +1,126 @@
+import csv
+import json
+from array import array
+
+# Compact result model and report writers. Reports are written piece by piece to an open file, so the
+# full report text never has to be built in memory.
+
+
+# Result of one file: the tickets/IDs of each issue in report order, plus a message table for "Other".
+# Every "Other" message is stored once and its tickets/IDs refer to it by index.
+class CompactResult:
+    def __init__(self):
+        self.numbers = {
+            "Full Capping": [],
+            "Other": []
+        }
+        self.messages = []
+        self.message_refs = array('l')  # index into messages for each "Other" ticket/ID
+
+    @property
+    def issues(self):
+        return list(self.numbers)
+
+    # Function to add tickets/IDs to an issue; the issue is listed even if none are added
+    def add(self, issue, numbers):
+        self.numbers.setdefault(issue, []).extend(numbers)
+
+    # Function to add "Other" tickets/IDs found in message; consecutive calls for one message store it once
+    def add_other(self, numbers, message):
+        if not numbers:
+            return
+        if not self.messages or self.messages[-1] is not message:
+            self.messages.append(message)
+        self.numbers["Other"].extend(numbers)
+        self.message_refs.extend([len(self.messages) - 1] * len(numbers))
+
+    def count(self, issue):
+        return len(self.numbers.get(issue, ()))
+
+    def total(self):
+        return sum(map(len, self.numbers.values()))
+
+    # Function to get the entries of an issue from start to stop as (ticket/ID, message or None) pairs
+    def entries(self, issue, start=0, stop=None):
+        numbers = self.numbers.get(issue, [])[start:stop]
+        if issue != "Other":
+            return [(number, None) for number in numbers]
+        return [(number, self.messages[ref]) for number, ref in zip(numbers, self.message_refs[start:stop])]
+
+    # Function to stream all entries of an issue without copying them
+    def iter_entries(self, issue):
+        numbers = self.numbers.get(issue, [])
+        if issue != "Other":
+            return ((number, None) for number in numbers)
+        return ((number, self.messages[ref]) for number, ref in zip(numbers, self.message_refs))
+
+    def to_dict(self):
+        return {"numbers": self.numbers, "messages": self.messages, "message_refs": self.message_refs.tolist()}
+
+    @classmethod
+    def from_dict(cls, data):
+        result = cls()
+        result.numbers = data["numbers"]
+        result.messages = data["messages"]
+        result.message_refs = array('l', data["message_refs"])
+        return result
+
+    def __eq__(self, other):
+        if not isinstance(other, CompactResult):
+            return NotImplemented
+        return self.numbers == other.numbers and list(self.iter_entries("Other")) == list(other.iter_entries("Other"))
+
+
+# Function to yield the pieces of the plain-text report, in the layout the app has always used;
+# the report is the pieces joined by "\n"
+def iter_result_text(result):
+    for issue in result.issues:
+        yield f"Issue: {issue}"
+        if issue == "Other":
+            for number, message in result.iter_entries(issue):
+                yield f"Ticket/ID: {number}\nMessage: {message}"
+        else:
+            yield from result.numbers[issue]
+        yield "\n"  # Add a newline for separation
+
+
+# Function to render a result as the plain-text report shown and downloaded by the app
+def format_result(result):
+    return "\n".join(iter_result_text(result))
+
+
+# Function to write the plain-text reports of several files, separated like the combined report
+def write_text(results, out):
+    first = True
+    for result in results.values():
+        for piece in iter_result_text(result):
+            out.write(piece if first else "\n" + piece)
+            first = False
+
+
+# Function to write results as CSV, one row per ticket/ID; the message is only filled in for "Other"
+def write_csv(results, out):
+    writer = csv.writer(out)
+    writer.writerow(["file", "issue", "ticket_id", "message"])
+    for file_name, result in results.items():
+        for issue in result.issues:
+            writer.writerows(
+                (file_name, issue, number, "" if message is None else message)
+                for number, message in result.iter_entries(issue)
+            )
+
+
+# Function to write results as JSON ({file: {issue: [tickets/IDs]}}, with "Other" entries as objects
+# holding the message), one entry at a time
+def write_json(results, out):
+    out.write("{")
+    for file_index, (file_name, result) in enumerate(results.items()):
+        out.write(f'{"," if file_index else ""}\n  {json.dumps(file_name)}: {{')
+        for issue_index, issue in enumerate(result.issues):
+            out.write(f'{"," if issue_index else ""}\n    {json.dumps(issue)}: [')
+            for entry_index, (number, message) in enumerate(result.iter_entries(issue)):
+                entry = number if message is None else {"ticket_id": number, "message": message}
+                out.write(f'{", " if entry_index else ""}{json.dumps(entry)}')
+            out.write("]")
+        out.write("\n  }")
+    out.write("\n}\n")